@@ -1,6 +1,19 @@
 """
 This script defines the camera specs
 """
+from enum import IntEnum
+
+class CamType(IntEnum):
+    """
+    Camera types, as identified by the hardware ID
+    """
+    UNKNOWN = 0
+    A8_MINI = 1
+    ZR10 = 2
+    ZT6 = 3
+    ZT30 = 4
+    A2_MINI = 5
+    ZR30 = 6
 
 class A8MINI:
     MAX_YAW_DEG = 135.0
@@ -7,15 +7,24 @@ Copyright 2022
 
 """
 from os import stat
-from crc16_python import crc16_str_swap
+from crc16_python import crc16_str_swap, crc16
 import logging
-from utils import toHex
+import struct
+from typing import Optional, Tuple, Union
+from cameras import CamType
+
+# Frame fields after the header: data length, sequence, command ID. Then the CRC16 at the end
+_FRAME_FIELDS = struct.Struct('<HHB')
+_CRC16 = struct.Struct('<H')
 
 class FirmwareMsg:
-    seq=0
-    code_board_ver=''
-    gimbal_firmware_ver=''
-    zoom_firmware_ver=''
+    __slots__ = ('seq', 'code_board_ver', 'gimbal_firmware_ver', 'zoom_firmware_ver')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.code_board_ver=''
+        self.gimbal_firmware_ver=''
+        self.zoom_firmware_ver=''
 
 class HardwareIDMsg:
     # x6B: ZR10
@@ -25,76 +34,114 @@ class HardwareIDMsg:
     # x83: ZT6
     # x7A: ZT30
     CAM_DICT ={'6B': 'ZR10', '73': 'A8 mini', '75': 'A2 mini', '78': 'ZR30', '83': 'ZT6', '7A': 'ZT30'}
-    seq=0
-    id=''
-    cam_type_str=''
+    CAM_TYPE_DICT ={'6B': CamType.ZR10, '73': CamType.A8_MINI, '75': CamType.A2_MINI, '78': CamType.ZR30, '83': CamType.ZT6, '7A': CamType.ZT30}
+    __slots__ = ('seq', 'id', 'cam_type_str', 'cam_type')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.id=''
+        self.cam_type_str=''
+        self.cam_type=CamType.UNKNOWN
 
 class AutoFocusMsg:
-    seq=0
-    success=False
+    __slots__ = ('seq', 'success')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.success=False
 
 class ManualZoomMsg:
-    seq=0
-    level=-1
+    __slots__ = ('seq', 'level')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.level=-1
 
 class ManualFocusMsg:
-    seq=0
-    success=False
+    __slots__ = ('seq', 'success')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.success=False
 
 class GimbalSpeedMsg:
-    seq=0
-    success=False
+    __slots__ = ('seq', 'success')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.success=False
 
 class CenterMsg:
-    seq=0
-    success=False
+    __slots__ = ('seq', 'success')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.success=False
 
 class RecordingMsg:
-    seq=0
-    state=-1
     OFF=0
     ON=1
     TF_EMPTY=2
     TD_DATA_LOSS=3
+    __slots__ = ('seq', 'state')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.state=-1
 
 class MountDirMsg:
-    seq=0
-    dir=-1
     NORMAL=0
     UPSIDE=1
+    __slots__ = ('seq', 'dir')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.dir=-1
 
 class MotionModeMsg:
-    seq=0
-    mode=-1
     LOCK=0
     FOLLOW=1
     FPV=2
+    __slots__ = ('seq', 'mode')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.mode=-1
 
 
 class FuncFeedbackInfoMsg:
-    seq=0
-    info_type=None
     SUCCESSFUL=0
     PHOTO_FAIL=1
     HDR_ON=2
     HDR_OFF=3
     RECROD_FAIL=4
+    __slots__ = ('seq', 'info_type')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.info_type=None
 
 class AttitdueMsg:
-    seq=    0
-    stamp=  0 # seconds
-    yaw=    0.0
-    pitch=  0.0
-    roll=   0.0
-    yaw_speed=  0.0 # deg/s
-    pitch_speed=0.0
-    roll_speed= 0.0
+    __slots__ = ('seq', 'stamp', 'yaw', 'pitch', 'roll', 'yaw_speed', 'pitch_speed', 'roll_speed')
+
+    def __init__(self) -> None:
+        self.seq=    0
+        self.stamp=  0 # seconds
+        self.yaw=    0.0
+        self.pitch=  0.0
+        self.roll=   0.0
+        self.yaw_speed=  0.0 # deg/s
+        self.pitch_speed=0.0
+        self.roll_speed= 0.0
 
 class SetGimbalAnglesMsg:
-    seq = 0
-    yaw = 0.0
-    pitch = 0.0
-    roll = 0.0
+    __slots__ = ('seq', 'yaw', 'pitch', 'roll')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.yaw = 0.0
+        self.pitch = 0.0
+        self.roll = 0.0
 
 class RequestDataStreamMsg:
     # data_type uint8_t
@@ -104,71 +151,100 @@ class RequestDataStreamMsg:
     # Frequency
     FREQ = {0: '00', 2: '01', 4: '02', 5: '03', 10: '04', 20: '05', 50: '06', 100: '07'}
 
-    seq = 0 
-    data_type = 1 # uint8_t
-    data_frequency = 0 # 0 means OFF (0, 2, 4, 5, 10, 20, 50, 100)
+    __slots__ = ('seq', 'data_type', 'data_frequency')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.data_type = 1 # uint8_t
+        self.data_frequency = 0 # 0 means OFF (0, 2, 4, 5, 10, 20, 50, 100)
 
 class RequestAbsoluteZoomMsg:
-    seq = 0
-    success = 0
+    __slots__ = ('seq', 'success')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.success = 0
 
 class  CurrentZoomValueMsg:
-    seq = 0
-    int_part = 1
-    float_part = 0
-    level=0.0
+    __slots__ = ('seq', 'int_part', 'float_part', 'level')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.int_part = 1
+        self.float_part = 0
+        self.level=0.0
 
 class TemperatureAtPointMsg:
-    seq = 0
-    temp = 0.0
-    x = 0.0
-    y = 0.0
+    __slots__ = ('seq', 'temp', 'x', 'y')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.temp = 0.0
+        self.x = 0.0
+        self.y = 0.0
 
 class GimbalCameraSoftRestartMsg:
-    seq = 0
-    camera_reboot_status = 0
-    gimbal_reboot_status = 0
+    __slots__ = ('seq', 'camera_reboot_status', 'gimbal_reboot_status')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.camera_reboot_status = 0
+        self.gimbal_reboot_status = 0
 
 class RequestGimbalCameraCodecSpecsMsg:
-    seq = 0
-    req_stream_type = 0 # 0: recording stream, 1: main stream, 2: sub stream
+    __slots__ = ('seq', 'req_stream_type', 'stream_type', 'video_enc_type', 'resolution_l', 'resolution_h',
+                 'video_bitrate', 'video_framerate', 'sta')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.req_stream_type = 0 # 0: recording stream, 1: main stream, 2: sub stream
+        # Codec specs in the reply
+        self.stream_type = 0
+        self.video_enc_type = 0 # 1: H.264, 2: H.265
+        self.resolution_l = 0
+        self.resolution_h = 0
+        self.video_bitrate = 0 # kbps
+        self.video_framerate = 0
+        self.sta = 0
 
 class SendGimbalCameraCodecSpecsMsg:
-    seq = 0
-    stream_type = 0 # 0: recording stream, 1: main stream, 2: sub stream
-    video_enc_type = 1 # 1: H.264, 2: H.265
-    resolution_l = 1920 # 1920 or 1280
-    resolution_h = 1080 # 1080 or 720
-    video_bitrate = 30 # bitrate in kbps
-    reserve = 0 # 0
+    __slots__ = ('seq', 'stream_type', 'video_enc_type', 'resolution_l', 'resolution_h', 'video_bitrate', 'reserve', 'sta')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.stream_type = 0 # 0: recording stream, 1: main stream, 2: sub stream
+        self.video_enc_type = 1 # 1: H.264, 2: H.265
+        self.resolution_l = 1920 # 1920 or 1280
+        self.resolution_h = 1080 # 1080 or 720
+        self.video_bitrate = 30 # bitrate in kbps
+        self.reserve = 0 # 0
+        self.sta = 0 # 1: success, 0: fail
 
 class RequestGimbalCameraImageModeMsg:
-    seq=0
-    success=False
-    vdisp_mode = 0  # Display mode:
-                    # 0: Split (Main: Zoom & Thermal, Sub: Wide)
-                    # 1: Split (Main: Wide & Thermal, Sub: Zoom) 
-                    # 2: Split (Main: Zoom & Wide, Sub: Thermal)
-                    # 3: Single (Main: Zoom, Sub: Thermal)
-                    # 4: Single (Main: Zoom, Sub: Wide)
-                    # 5: Single (Main: Wide, Sub: Thermal)
-                    # 6: Single (Main: Wide, Sub: Zoom)
-                    # 7: Single (Main: Thermal, Sub: Zoom)
-                    # 8: Single (Main: Thermal, Sub: Wide)
-    description = ""  # String description of the current mode
+    __slots__ = ('seq', 'success', 'vdisp_mode', 'description')
+
+    def __init__(self) -> None:
+        self.seq=0
+        self.success=False
+        self.vdisp_mode = 0  # Display mode:
+                             # 0: Split (Main: Zoom & Thermal, Sub: Wide)
+                             # 1: Split (Main: Wide & Thermal, Sub: Zoom)
+                             # 2: Split (Main: Zoom & Wide, Sub: Thermal)
+                             # 3: Single (Main: Zoom, Sub: Thermal)
+                             # 4: Single (Main: Zoom, Sub: Wide)
+                             # 5: Single (Main: Wide, Sub: Thermal)
+                             # 6: Single (Main: Wide, Sub: Zoom)
+                             # 7: Single (Main: Thermal, Sub: Zoom)
+                             # 8: Single (Main: Thermal, Sub: Wide)
+        self.description = ""  # String description of the current mode
 
 class SendGimbalCameraImageModeMsg:
-    seq = 0
-    vdisp_mode = 0  # Display mode:
-                    # 0: Split (Main: Zoom & Thermal, Sub: Wide)
-                    # 1: Split (Main: Wide & Thermal, Sub: Zoom) 
-                    # 2: Split (Main: Zoom & Wide, Sub: Thermal)
-                    # 3: Single (Main: Zoom, Sub: Thermal)
-                    # 4: Single (Main: Zoom, Sub: Wide)
-                    # 5: Single (Main: Wide, Sub: Thermal)
-                    # 6: Single (Main: Wide, Sub: Zoom)
-                    # 7: Single (Main: Thermal, Sub: Zoom)
-                    # 8: Single (Main: Thermal, Sub: Wide)
+    __slots__ = ('seq', 'vdisp_mode', 'description')
+
+    def __init__(self) -> None:
+        self.seq = 0
+        self.vdisp_mode = 0  # Display mode, same values as RequestGimbalCameraImageModeMsg
+        self.description = ""
 
 class COMMAND:
     ACQUIRE_FW_VER = '01'
@@ -212,15 +288,19 @@ class SIYIMESSAGE:
 
         self._seq= 0
 
-        self._cmd_id='00' # 1 byte
+        # 1 byte, in hex, or as an integer when decoded by decodeBytes()
+        self._cmd_id: Union[str, int] = '00'
         
         self._data_len = 0
         
-        # String of data byes (in hex)
-        self._data=''
+        # String of data byes (in hex), or data bytes when decoded by decodeBytes()
+        self._data: Union[str, bytes] = ''
 
         self._crc16='0000' # low byte (2 characters) on the left!
 
+        # STX+CTRL as bytes, for encodeMsgBytes()
+        self._header_bytes = bytes.fromhex(self.HEADER+self._ctr)
+
     
     def incrementSEQ(self, val):
         """
@@ -338,7 +418,7 @@ class SIYIMESSAGE:
         low_b = msg[6:8] # low byte
         high_b = msg[8:10] # high byte
         data_len = high_b+low_b
-        data_len = int('0x'+data_len, base=16)
+        data_len = int(data_len, 16)
         char_len = data_len*2 # number of characters. Each byte is represented by two characters in hex, e.g. '0A'= 2 chars
 
         # check crc16, if msg is OK!
@@ -353,7 +433,7 @@ class SIYIMESSAGE:
         low_b = msg[10:12] # low byte
         high_b = msg[12:14] # high byte
         seq_hex = high_b+low_b
-        seq = int('0x'+seq_hex, base=16)
+        seq = int(seq_hex, 16)
         
         # CMD ID
         cmd_id = msg[14:16]
@@ -370,6 +450,53 @@ class SIYIMESSAGE:
 
         return data, data_len, cmd_id, seq
 
+    def decodeBytes(self, msg: bytes, check_crc: bool = True) -> Optional[Tuple[bytes, int, int, int]]:
+        """
+        Decodes raw message bytes, and returns the DATA bytes.
+        Same as decodeMsg(), but works directly on the received bytes, without hex-string conversion.
+        The command ID is returned as an integer, so it can be looked up without formatting it.
+
+        Params
+        --
+        msg: [bytes] full message bytes (header to CRC16)
+        check_crc: [bool] Set to False if the caller already checked the CRC16 of msg
+
+        Returns
+        --
+        - data [bytes] data bytes.
+        - data_len [int] Number of data bytes
+        - cmd_id [int] command ID byte
+        - seq [int] message sequence
+        """
+        data = None
+
+        # 10 bytes: STX+CTRL+Data_len+SEQ+CMD_ID+CRC16
+        #            2 + 1  +    2   + 2 +   1  + 2
+        MINIMUM_DATA_LENGTH=10
+        if len(msg)<MINIMUM_DATA_LENGTH:
+            self._logger.error("No data to decode")
+            return data
+
+        # Data length and sequence are little endian, according to SIYI SDK
+        data_len, seq, cmd_id = _FRAME_FIELDS.unpack_from(msg, 3)
+
+        # check crc16, if msg is OK!
+        if check_crc:
+            msg_crc, = _CRC16.unpack_from(msg, len(msg)-2)
+            expected_crc = crc16(msg[:-2])
+            if expected_crc!=msg_crc:
+                self._logger.error("CRC16 is not valid. Got %04x. Expected %04x. Message might be corrupted!", msg_crc, expected_crc)
+                return data
+
+        # DATA
+        data = msg[8:8+data_len]
+
+        self._data = data
+        self._data_len = data_len
+        self._cmd_id = cmd_id
+
+        return data, data_len, cmd_id, seq
+
     def encodeMsg(self, data, cmd_id):
         """
         Encodes a msg according to SDK protocol
@@ -391,153 +518,171 @@ class SIYIMESSAGE:
             self._logger.error("Could not encode message. crc16 is None")
             return ''
 
+    def encodeMsgBytes(self, data: bytes, cmd_id: str) -> bytes:
+        """
+        Encodes a msg according to SDK protocol, directly as bytes
+
+        Params
+        --
+        - data [bytes] data bytes
+        - cmd_id [str] command ID
+
+        Returns
+        --
+        [bytes] Encoded msg
+        """
+        self._seq = (self._seq+1) & 0xffff
+        # SEQ is sent as zero, same as encodeMsg()
+        msg_front = self._header_bytes + _FRAME_FIELDS.pack(len(data), 0, int(cmd_id, 16)) + data
+        return msg_front + _CRC16.pack(crc16(msg_front))
+
     ########################################################
     #               Message definitions                    #
     ########################################################
     
     def firmwareVerMsg(self):
         """
-        Returns message string of the Acqsuire Firmware Version msg
+        Returns message bytes of the Acqsuire Firmware Version msg
         """
-        data=""
+        data=b''
         cmd_id = COMMAND.ACQUIRE_FW_VER
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def hwIdMsg(self):
         """
-        Returns message string for the Acquire Hardware ID
+        Returns message bytes for the Acquire Hardware ID
         """
-        data=""
+        data=b''
         cmd_id = COMMAND.ACQUIRE_HW_ID
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def gimbalInfoMsg(self):
         """
         Gimbal status information msg
         """
-        data=""
+        data=b''
         cmd_id = COMMAND.ACQUIRE_GIMBAL_INFO
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def funcFeedbackMsg(self):
         """
         Function feedback information msg
         """
-        data=""
+        data=b''
         cmd_id = COMMAND.FUNC_FEEDBACK_INFO
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def takePhotoMsg(self):
         """
         Take photo msg
         """
-        data="00"
+        data=b'\x00'
         cmd_id = COMMAND.PHOTO_VIDEO_HDR
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def recordMsg(self):
         """
         Video Record msg
         """
-        data="02"
+        data=b'\x02'
         cmd_id = COMMAND.PHOTO_VIDEO_HDR
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def autoFocusMsg(self):
         """
         Auto focus msg
         """
-        data="01"
+        data=b'\x01'
         cmd_id = COMMAND.AUTO_FOCUS
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def centerMsg(self):
         """
         Center gimbal msg
         """
-        data="01"
+        data=b'\x01'
         cmd_id = COMMAND.CENTER
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def lockModeMsg(self):
         """
         Lock mode msg
         """
-        data="03"
+        data=b'\x03'
         cmd_id = COMMAND.PHOTO_VIDEO_HDR
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def followModeMsg(self):
         """
         Follow mode msg
         """
-        data="04"
+        data=b'\x04'
         cmd_id = COMMAND.PHOTO_VIDEO_HDR
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def fpvModeMsg(self):
         """
         FPV mode msg
         """
-        data="05"
+        data=b'\x05'
         cmd_id = COMMAND.PHOTO_VIDEO_HDR
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def gimbalAttMsg(self):
         """
         Acquire Gimbal Attiude msg
         """
-        data=""
+        data=b''
         cmd_id = COMMAND.ACQUIRE_GIMBAL_ATT
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def zoomInMsg(self):
         """
         Zoom in Msg
         """
-        data=toHex(1,8)
+        data=struct.pack('<b', 1)
         cmd_id = COMMAND.MANUAL_ZOOM
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def zoomOutMsg(self):
         """
         Zoom out Msg
         """
-        data=toHex(-1,8)
+        data=struct.pack('<b', -1)
         cmd_id = COMMAND.MANUAL_ZOOM
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def stopZoomMsg(self):
         """
         Stop Zoom Msg
         """
-        data=toHex(0,8)
+        data=struct.pack('<b', 0)
         cmd_id = COMMAND.MANUAL_ZOOM
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def longFocusMsg(self):
         """
         Focus 1 Msg
         """
-        data="01"
+        data=b'\x01'
         cmd_id = COMMAND.MANUAL_FOCUS
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def closeFocusMsg(self):
         """
         Focus -1 Msg
         """
-        data="ff"
+        data=b'\xff'
         cmd_id = COMMAND.MANUAL_FOCUS
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def stopFocusMsg(self):
         """
         Focus 0 Msg
         """
-        data="00"
+        data=b'\x00'
         cmd_id = COMMAND.MANUAL_FOCUS
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def gimbalSpeedMsg(self, yaw_speed, pitch_speed):
         """
@@ -561,11 +706,9 @@ class SIYIMESSAGE:
         if pitch_speed<-100:
             pitch_speed=-100
 
-        data1=toHex(yaw_speed, 8)
-        data2=toHex(pitch_speed, 8)
-        data=data1+data2
+        data=struct.pack('<bb', yaw_speed, pitch_speed)
         cmd_id = COMMAND.GIMBAL_SPEED
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def setGimbalAttitude(self, target_yaw_deg, target_pitch_deg):
         """
@@ -581,11 +724,9 @@ class SIYIMESSAGE:
         - pitch_speed [int16] in degrees up to 1 decimal
         """
 
-        yaw_hex = toHex(target_yaw_deg, 16)
-        pitch_hex = toHex(target_pitch_deg, 16)
-        data = yaw_hex+pitch_hex
+        data = struct.pack('<hh', target_yaw_deg, target_pitch_deg)
         cmd_id = COMMAND.SET_GIMBAL_ATTITUDE
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def dataStreamMsg(self, dtype: int, freq: int):
         """
@@ -604,18 +745,18 @@ class SIYIMESSAGE:
         elif dtype == 2:
             data_type_hex = RequestDataStreamMsg.LASER_DATA
         else:
-            self._logger.error(f"Data stream type {type} not supported. Must be 1 (atitude) or 2 (laser)")
-            return ''
+            self._logger.error("Data stream type %s not supported. Must be 1 (atitude) or 2 (laser)", dtype)
+            return b''
         
         f = int(freq)
         try:
             f_hex = RequestDataStreamMsg.FREQ[f]
         except Exception as e:
-            self._logger.error(f"Frequency {freq} not supported {e}. Not requesting attitude stream.")
-            return ''
-        data = data_type_hex+f_hex
+            self._logger.error("Frequency %s not supported %s. Not requesting attitude stream.", freq, e)
+            return b''
+        data = bytes.fromhex(data_type_hex+f_hex)
         cmd_id = COMMAND.SET_DATA_STREAM
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def absoluteZoomMsg(self, zoom_level: float):
         """
@@ -629,17 +770,15 @@ class SIYIMESSAGE:
         # Get the first decimal place as an integer
         decimal_part = int((zoom_level * 10) % 10)
 
-        d1 = toHex(integer_part, 8)
-        d2 = toHex(decimal_part, 8)
-        data = d1+d2
+        data = struct.pack('<BB', integer_part, decimal_part)
         cmd_id = COMMAND.ABSOLUTE_ZOOM
 
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def requestCurrentZoomMsg(self):
-        data=""
+        data=b''
         cmd_id = COMMAND.CURRENT_ZOOM_VALUE
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def requestTemperatureAtPointMsg(self,x,y,get_temp_flag):
         """
@@ -651,13 +790,11 @@ class SIYIMESSAGE:
             2: Continuous temperature measuring at 5 Hz
         """
         # Default to center point and single measurement
-        x_uint16 = toHex(x, 16) # Center x coordinate (32767)
-        y_uint16 = toHex(y, 16) # Center y coordinate (32767)
         flag_uint8 = int(get_temp_flag)
 
-        data = x_uint16 + y_uint16 + toHex(flag_uint8, 8)
+        data = struct.pack('<HHB', x, y, flag_uint8) # Center coordinates are (32767, 32767)
         cmd_id = COMMAND.REQUEST_TEMPERATURE_AT_POINT
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def gimbalCameraSoftRestartMsg(self, camera_reboot: int, gimbal_reboot: int):
         """
@@ -669,9 +806,9 @@ class SIYIMESSAGE:
             0: No action
             1: Gimbal restart
         """
-        data=toHex(camera_reboot, 8) + toHex(gimbal_reboot, 8)
+        data=struct.pack('<BB', camera_reboot, gimbal_reboot)
         cmd_id = COMMAND.GIMBAL_CAMERA_SOFT_RESTART
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def requestGimbalCameraCodecSpecsMsg(self, stream_type: int):
         """
@@ -681,27 +818,27 @@ class SIYIMESSAGE:
             1: main stream
             2: sub stream
         """
-        data=toHex(stream_type, 8)
+        data=struct.pack('<B', stream_type)
         cmd_id = COMMAND.REQUEST_GIMBAL_CAMERA_CODEC_SPECS
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def sendGimbalCameraCodecSpecsMsg(self, stream_type: int, video_enc_type: int, resolution_l: int, resolution_h: int, video_bitrate: int):
         """
         Send Gimbal Camera Codec Specs Msg
         """
-        data=toHex(stream_type, 8) + toHex(video_enc_type, 8) + toHex(resolution_l, 16) + toHex(resolution_h, 16) + toHex(video_bitrate, 16)
+        data=struct.pack('<BBHHH', stream_type, video_enc_type, resolution_l, resolution_h, video_bitrate)
         cmd_id = COMMAND.SEND_CODEC_SPECS_TO_GIMBAL_CAMERA
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
 
     def requestGimbalCameraImageModeMsg(self):
-        data=""
+        data=b''
         cmd_id = COMMAND.REQUEST_GIMBAL_CAMERA_IMAGE_MODE
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
     
     def sendGimbalCameraImageModeMsg(self, vdisp_mode: int):
         """
         Send Gimbal Camera Image Mode Msg
         """
-        data=toHex(vdisp_mode, 8)
+        data=struct.pack('<B', vdisp_mode)
         cmd_id = COMMAND.SEND_GIMBAL_CAMERA_IMAGE_MODE
-        return self.encodeMsg(data, cmd_id)
+        return self.encodeMsgBytes(data, cmd_id)
@@ -7,22 +7,132 @@ Copyright 2022
 
 """
 import socket
-from siyi_message import *
-from time import sleep, time
+import selectors
+import heapq
+from collections import deque
+from siyi_message import (SIYIMESSAGE, COMMAND, FirmwareMsg, HardwareIDMsg, AutoFocusMsg, ManualZoomMsg, ManualFocusMsg,
+                          GimbalSpeedMsg, CenterMsg, RecordingMsg, MountDirMsg, MotionModeMsg, FuncFeedbackInfoMsg, AttitdueMsg,
+                          SetGimbalAnglesMsg, RequestDataStreamMsg, RequestAbsoluteZoomMsg, CurrentZoomValueMsg, TemperatureAtPointMsg,
+                          GimbalCameraSoftRestartMsg, RequestGimbalCameraCodecSpecsMsg, SendGimbalCameraCodecSpecsMsg,
+                          RequestGimbalCameraImageModeMsg, SendGimbalCameraImageModeMsg)
+from time import sleep, time, monotonic
 import logging
-from utils import  toInt
 import threading
+import queue
 import cameras
 import struct
+from socket_utils import RecvMMsg, HAVE_RECVMMSG, ZeroCopySender, tuneUDPSocket
+from uring_utils import URingReceiver
+from crc16_python import crc16
+
+# Binary layouts of the received data (little endian), compiled once
+_U16LE = struct.Struct('<H')
+_ATTITUDE = struct.Struct('<6h')
+_GIMBAL_INFO = struct.Struct('<3B')
+_CURRENT_ZOOM = struct.Struct('<BB')
+_TEMP_AT_POINT = struct.Struct('<HHH')
+_SOFT_RESTART = struct.Struct('<BB')
+_CODEC_SPECS = struct.Struct('<BBHHHB')
+_CODEC_SPECS_ACK = struct.Struct('<BB')
+
+# Minimum number of data bytes of the replies, checked before parsing. Replies that are not listed are not checked.
+# Keyed by the CMD ID byte, as returned by SIYIMessage.decodeBytes()
+_MIN_DATA_LEN = {int(cmd_id, 16): min_len for cmd_id, min_len in {
+    COMMAND.ACQUIRE_GIMBAL_INFO: _GIMBAL_INFO.size+3,
+    COMMAND.ACQUIRE_GIMBAL_ATT: _ATTITUDE.size,
+    COMMAND.FUNC_FEEDBACK_INFO: 1,
+    COMMAND.GIMBAL_SPEED: 1,
+    COMMAND.AUTO_FOCUS: 1,
+    COMMAND.MANUAL_FOCUS: 1,
+    COMMAND.MANUAL_ZOOM: _U16LE.size,
+    COMMAND.CENTER: 1,
+    COMMAND.SET_DATA_STREAM: 1,
+    COMMAND.CURRENT_ZOOM_VALUE: _CURRENT_ZOOM.size,
+    COMMAND.REQUEST_TEMPERATURE_AT_POINT: _TEMP_AT_POINT.size,
+    COMMAND.GIMBAL_CAMERA_SOFT_RESTART: _SOFT_RESTART.size,
+    COMMAND.REQUEST_GIMBAL_CAMERA_CODEC_SPECS: _CODEC_SPECS.size,
+    COMMAND.SEND_CODEC_SPECS_TO_GIMBAL_CAMERA: _CODEC_SPECS_ACK.size,
+    COMMAND.REQUEST_GIMBAL_CAMERA_IMAGE_MODE: 1,
+    COMMAND.ABSOLUTE_ZOOM: 1,
+}.items()}
+
+# Descriptions of the image modes (vdisp_mode) of the ZT6 and ZT30, indexed by mode
+_IMAGE_MODE_DESCRIPTIONS = (
+    "Split Screen (Main: Zoom & Thermal. Sub: Wide Angle)",
+    "Split Screen (Main: Wide Angle & Thermal. Sub: Zoom)",
+    "Split Screen (Main: Zoom & Wide Angle. Sub: Thermal)",
+    "Single Images (Main: Zoom. Sub: Thermal)",
+    "Single Images (Main: Zoom. Sub: Wide Angle)",
+    "Single Images (Main: Wide Angle. Sub: Thermal)",
+    "Single Images (Main: Wide Angle. Sub: Zoom)",
+    "Single Images (Main: Thermal. Sub: Zoom)",
+    "Single Images (Main: Thermal. Sub: Wide Angle)",
+)
+
+# RTSP streams of the ZT6 and ZT30, and the stream of each video source, indexed by image mode
+_RTSP_MAIN_URL = "rtsp://192.168.144.25:8554/video1"
+_RTSP_SUB_URL = "rtsp://192.168.144.25:8554/video2"
+_RTSP_MODE_MAP = (
+    {"rgb": _RTSP_MAIN_URL, "thermal": _RTSP_MAIN_URL},     # 0: Split Screen (Main: Zoom & Thermal. Sub: Wide Angle)
+    {"rgb": _RTSP_MAIN_URL, "thermal": _RTSP_MAIN_URL},     # 1: Split Screen (Main: Wide Angle & Thermal. Sub: Zoom)
+    {"rgb": _RTSP_MAIN_URL, "thermal": _RTSP_SUB_URL},      # 2: Split Screen (Main: Zoom & Wide Angle. Sub: Thermal)
+    {"rgb": _RTSP_MAIN_URL, "thermal": _RTSP_SUB_URL},      # 3: Single Image (Main: Zoom. Sub: Thermal)
+    {"rgb": _RTSP_MAIN_URL, "rgb_wide": _RTSP_SUB_URL},     # 4: Single Image (Main: Zoom. Sub: Wide Angle)
+    {"rgb": _RTSP_MAIN_URL, "thermal": _RTSP_SUB_URL},      # 5: Single Image (Main: Wide Angle. Sub: Thermal)
+    {"rgb_wide": _RTSP_MAIN_URL, "rgb": _RTSP_SUB_URL},     # 6: Single Image (Main: Wide Angle. Sub: Zoom)
+    {"thermal": _RTSP_MAIN_URL, "rgb": _RTSP_SUB_URL},      # 7: Single Image (Main: Thermal. Sub: Zoom)
+    {"thermal": _RTSP_MAIN_URL, "rgb_wide": _RTSP_SUB_URL}, # 8: Single Image (Main: Thermal. Sub: Wide Angle)
+)
+
+def _controlStep(yaw, pitch, cur_yaw, cur_pitch, gain, th):
+    """
+    One step of the gimbal rotation P controller
+
+    Params
+    --
+    - yaw, pitch [float] Desired angles, in degrees
+    - cur_yaw, cur_pitch [float] Current angles, in degrees
+    - gain [float] Proportional gain
+    - th [float] Acceptable error, in degrees
+
+    Returns
+    --
+    (done, yaw_speed, pitch_speed) done is True when both errors are within th.
+    Speeds are saturated to [-100, 100]
+    """
+    yaw_err = -yaw + cur_yaw # NOTE for some reason it's reversed!!
+    pitch_err = pitch - cur_pitch
+    if abs(yaw_err) <= th and abs(pitch_err) <= th:
+        return True, 0, 0
+
+    y_speed_sp = gain*yaw_err
+    y_speed_sp = -100 if y_speed_sp < -100 else 100 if y_speed_sp > 100 else int(y_speed_sp)
+    p_speed_sp = gain*pitch_err
+    p_speed_sp = -100 if p_speed_sp < -100 else 100 if p_speed_sp > 100 else int(p_speed_sp)
+    return False, y_speed_sp, p_speed_sp
+
+# Compile the controller with numba, if it is installed.
+# The signature makes numba compile it now, instead of on the first call in the setGimbalRotation() loop.
+# Callers pass floats, so there is a single specialization.
+# With a mypyc build the function is already native, and numba raises TypeError
+try:
+    import numba  # type: ignore
+    _controlStep = numba.njit("Tuple((boolean, int64, int64))(float64, float64, float64, float64, float64, float64)",
+                              cache=True)(_controlStep)
+except (ImportError, TypeError):
+    pass
 
 
 class SIYISDK:
-    def __init__(self, server_ip="192.168.144.25", port=37260, debug=False):
+    def __init__(self, server_ip="192.168.144.25", port=37260, debug=False, zerocopy=False, io_uring=False, parse_thread=False):
         """
         Params
         --
         - server_ip [str] IP address of the camera
         - port: [int] UDP port of the camera
+        - zerocopy [bool] Send with MSG_ZEROCOPY. Needs Linux 4.14+, falls back to regular sends if not supported
+        - io_uring [bool] Receive with io_uring. Needs the liburing package, falls back to recvmmsg/recv if not available
+        - parse_thread [bool] Decode and parse the received packets in a separate thread, so the event loop only receives
         """
         self._debug = debug
         if self._debug:
@@ -32,6 +142,9 @@ class SIYISDK:
         LOG_FORMAT = ' [%(levelname)s] %(asctime)s [SIYISDK::%(funcName)s] :\t%(message)s'
         logging.basicConfig(format=LOG_FORMAT, level=d_level)
         self._logger = logging.getLogger(self.__class__.__name__)
+        # Checked before the frequent debug logs (parsers, control loop), instead of calling isEnabledFor() every time.
+        # Updated on every connect(), so a level set on the logger between connections is taken into account
+        self._debug_enabled = self._logger.isEnabledFor(logging.DEBUG)
 
         # Message sent to the camera
         self._out_msg = SIYIMESSAGE(debug=self._debug)
@@ -39,34 +152,145 @@ class SIYISDK:
         # Message received from the camera
         self._in_msg = SIYIMESSAGE(debug=self._debug)        
 
+        # Messages without data parameters are always the same bytes (SEQ is sent as zero).
+        # Encode them once, so the requests are a single sendto()
+        self._pkt_fw = self._out_msg.firmwareVerMsg()
+        self._pkt_hw_id = self._out_msg.hwIdMsg()
+        self._pkt_att = self._out_msg.gimbalAttMsg()
+        self._pkt_info = self._out_msg.gimbalInfoMsg()
+        self._pkt_func_feedback = self._out_msg.funcFeedbackMsg()
+        self._pkt_zoom = self._out_msg.requestCurrentZoomMsg()
+        self._pkt_image_mode = self._out_msg.requestGimbalCameraImageModeMsg()
+        self._pkt_auto_focus = self._out_msg.autoFocusMsg()
+        self._pkt_zoom_in = self._out_msg.zoomInMsg()
+        self._pkt_zoom_out = self._out_msg.zoomOutMsg()
+        self._pkt_stop_zoom = self._out_msg.stopZoomMsg()
+        self._pkt_long_focus = self._out_msg.longFocusMsg()
+        self._pkt_close_focus = self._out_msg.closeFocusMsg()
+        self._pkt_stop_focus = self._out_msg.stopFocusMsg()
+        self._pkt_center = self._out_msg.centerMsg()
+        self._pkt_photo = self._out_msg.takePhotoMsg()
+        self._pkt_record = self._out_msg.recordMsg()
+        self._pkt_fpv_mode = self._out_msg.fpvModeMsg()
+        self._pkt_lock_mode = self._out_msg.lockModeMsg()
+        self._pkt_follow_mode = self._out_msg.followModeMsg()
+
         self._server_ip = server_ip
         self._port = port
 
-        self._BUFF_SIZE = 1024
+        self._BUFF_SIZE = 2048
+        # Preallocated receive buffer, and buffer of received bytes that are not parsed yet
+        self._rx_buf = bytearray(self._BUFF_SIZE)
+        self._parse_buf = bytearray()
+        # Drains queued datagrams in bursts, with one system call (Linux only)
+        self._RECV_BATCH = 32
+        self._rx_batch = RecvMMsg(self._RECV_BATCH, self._BUFF_SIZE) if HAVE_RECVMMSG else None
 
         self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Bigger kernel buffers, so bursts of telemetry are not dropped
+        tuneUDPSocket(self._socket, rcvbuf=1<<20, sndbuf=1<<18)
         self._rcv_wait_t = 5  # Receiving wait time
         self._socket.settimeout(self._rcv_wait_t)
+        # Optional zero-copy sends. Completions are read from the socket error queue in the event loop
+        self._zc_sender = None
+        if zerocopy:
+            try:
+                self._zc_sender = ZeroCopySender(self._socket)
+            except OSError as e:
+                self._logger.warning("MSG_ZEROCOPY is not supported, using regular sends: %s", e)
 
         self.resetVars()
 
+        # Yaw and pitch limits (min_yaw, max_yaw, min_pitch, max_pitch) of the supported cameras
+        self._angle_limits = {cam_type: (cam.MIN_YAW_DEG, cam.MAX_YAW_DEG, cam.MIN_PITCH_DEG, cam.MAX_PITCH_DEG)
+                              for cam_type, cam in ((cameras.CamType.A8_MINI, cameras.A8MINI),
+                                                    (cameras.CamType.ZR10, cameras.ZR10),
+                                                    (cameras.CamType.ZT6, cameras.ZT6))}
+
+        # Parser of each received CMD ID, keyed by the CMD ID byte, so a packet is dispatched with one dict lookup
+        self._dispatch = {int(cmd_id, 16): parser for cmd_id, parser in {
+            COMMAND.ACQUIRE_FW_VER: self.parseFirmwareMsg,
+            COMMAND.ACQUIRE_HW_ID: self.parseHardwareIDMsg,
+            COMMAND.ACQUIRE_GIMBAL_INFO: self.parseGimbalInfoMsg,
+            COMMAND.ACQUIRE_GIMBAL_ATT: self.parseAttitudeMsg,
+            COMMAND.FUNC_FEEDBACK_INFO: self.parseFunctionFeedbackMsg,
+            COMMAND.GIMBAL_SPEED: self.parseGimbalSpeedMsg,
+            COMMAND.AUTO_FOCUS: self.parseAutoFocusMsg,
+            COMMAND.MANUAL_FOCUS: self.parseManualFocusMsg,
+            COMMAND.MANUAL_ZOOM: self.parseZoomMsg,
+            COMMAND.CENTER: self.parseGimbalCenterMsg,
+            COMMAND.SET_GIMBAL_ATTITUDE: self.parseSetGimbalAnglesMsg,
+            COMMAND.SET_DATA_STREAM: self.parseRequestStreamMsg,
+            COMMAND.CURRENT_ZOOM_VALUE: self.parseCurrentZoomLevelMsg,
+            COMMAND.REQUEST_TEMPERATURE_AT_POINT: self.parseTemperatureAtPointMsg,
+            COMMAND.GIMBAL_CAMERA_SOFT_RESTART: self.parseGimbalCameraSoftRestartMsg,
+            COMMAND.REQUEST_GIMBAL_CAMERA_CODEC_SPECS: self.parseRequestGimbalCameraCodecSpecsMsg,
+            COMMAND.SEND_CODEC_SPECS_TO_GIMBAL_CAMERA: self.parseSendGimbalCameraCodecSpecsMsg,
+            COMMAND.REQUEST_GIMBAL_CAMERA_IMAGE_MODE: lambda data, seq: (self.parseRequestGimbalCameraImageModeMsg(data, seq),
+                                                                          self.parseSendGimbalCameraImageModeMsg(data, seq)),
+            COMMAND.ABSOLUTE_ZOOM: self.parseRequestAbsoluteZoomMsg,
+        }.items()}
+
         # Stop threads flag
         self._stop = False  
-        
-        self._recv_thread = threading.Thread(target=self.recvLoop)
 
-        # Connection thread
+        # Single event loop that receives data and sends the periodic requests.
+        # The wake-up socket pair interrupts select(), e.g. on disconnect()
+        self._sel = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        # Optional io_uring receiver. Its ring is readable when datagrams were received
+        self._uring = None
+        if io_uring:
+            try:
+                self._uring = URingReceiver(self._socket, self.bufferCallback, self._RECV_BATCH, self._BUFF_SIZE)
+            except OSError as e:
+                self._logger.warning("io_uring is not available, using the socket directly: %s", e)
+        if self._uring is not None:
+            self._sel.register(self._uring.fileno(), selectors.EVENT_READ, self._uring.reap)
+        else:
+            self._sel.register(self._socket, selectors.EVENT_READ, self._onReadable)
+        self._sel.register(self._wake_r, selectors.EVENT_READ, self._onWake)
+        # Heap of [deadline, id, period, callback]. Period is None for one-shot timers
+        self._timers = []
+        self._timer_id = 0
+        # The loop thread is started on the first connect() and lives as long as the object.
+        # It idles between disconnect() and the next connect()
+        self._loop_thread = threading.Thread(target=self._loopThread, daemon=True)
+        self._run_event = threading.Event()
+        self._idle_event = threading.Event()
+        self._idle_event.set()
+        self._loop_running = False
+        # Set by close(), ends the loop and parser threads
+        self._closed = False
+        # Outgoing messages, sent by the event loop. deque append/popleft are thread safe
+        self._tx_q = deque()
+        # Held while checking _loop_running and queueing, and while the loop stops.
+        # A message queued by sendMsgBytes() is always sent by the last flush of the loop
+        self._tx_lock = threading.Lock()
+        # Max size of a coalesced datagram. Kept below the ethernet MTU, as fragmentation is disabled
+        self._TX_MAX_DATAGRAM = 1400
+
+        # Optional parser thread. The event loop only extracts the packets, and queues them here.
+        # The queue is bounded, packets are dropped when the parser can not keep up
+        self._PARSE_QUEUE_SIZE = 1024
+        self._parse_q = queue.Queue(self._PARSE_QUEUE_SIZE) if parse_thread else None
+        self._parse_thread = threading.Thread(target=self._parseLoop, daemon=True) if parse_thread else None
+        self._parse_dropped = 0
+
+        # Connection check
         self._last_fw_seq = 0  # used to check on connection liveness
         self._conn_loop_rate = 1  # seconds
-        self._conn_thread = threading.Thread(target=self.connectionLoop, args=(self._conn_loop_rate,))
 
-        # Gimbal info thread @ 1Hz
+        # Gimbal info @ 1Hz
         self._gimbal_info_loop_rate = 1
-        self._g_info_thread = threading.Thread(target=self.gimbalInfoLoop, args=(self._gimbal_info_loop_rate,))
 
-        # Gimbal attitude thread @ 10Hz
+        # Gimbal attitude @ 50Hz
         self._gimbal_att_loop_rate = 0.02
-        self._g_att_thread = threading.Thread(target=self.gimbalAttLoop, args=(self._gimbal_att_loop_rate,))
+
+        # Set by the parser on every new attitude message, see setGimbalRotation()
+        self._att_event = threading.Event()
 
     def resetVars(self):
         """
@@ -94,6 +318,7 @@ class SIYISDK:
         self._request_gimbal_camera_codec_specs_msg = RequestGimbalCameraCodecSpecsMsg()
         self._send_gimbal_camera_codec_specs_msg = SendGimbalCameraCodecSpecsMsg()
         self._request_gimbal_camera_image_mode_msg = RequestGimbalCameraImageModeMsg()
+        self._send_gimbal_camera_image_mode_msg = SendGimbalCameraImageModeMsg()
         self._request_absolute_zoom_msg = RequestAbsoluteZoomMsg()
         self._last_att_seq = -1
 
@@ -111,22 +336,13 @@ class SIYISDK:
         retries = 0
         while retries < maxRetries:
             try:
-                # Initialize fresh thread instances for each connection attempt
-                self._recv_thread = threading.Thread(target=self.recvLoop)
-                self._conn_thread = threading.Thread(target=self.connectionLoop, args=(self._conn_loop_rate,))
-                self._g_info_thread = threading.Thread(target=self.gimbalInfoLoop, args=(self._gimbal_info_loop_rate,))
-                self._g_att_thread = threading.Thread(target=self.gimbalAttLoop, args=(self._gimbal_att_loop_rate,))
-                
-                self._logger.info(f"Attempting to connect to camera, attempt {retries + 1}")
-                self._recv_thread.start()
-                self._conn_thread.start()
+                self._logger.info("Attempting to connect to camera, attempt %d", retries + 1)
+                self._startLoop()
                 t0 = time()
 
                 while True:
                     if self._connected:
-                        self._logger.info(f"Successfully connected to camera on attempt {retries + 1}")
-                        self._g_info_thread.start()
-                        self._g_att_thread.start()
+                        self._logger.info("Successfully connected to camera on attempt %d", retries + 1)
 
                         self.requestHardwareID()
                         sleep(0.2)
@@ -141,136 +357,308 @@ class SIYISDK:
                         self.disconnect()
                         retries += 1
                         break
+                    # Yield to the event loop thread, compiled builds do not release the GIL while spinning
+                    sleep(0.01)
 
             except Exception as e:
-                self._logger.error(f"Connection attempt {retries + 1} failed: {e}")
+                self._logger.error("Connection attempt %d failed: %s", retries + 1, e)
                 self.disconnect()
                 retries += 1
 
-        self._logger.error(f"Failed to connect after {maxRetries} retries")
+        self._logger.error("Failed to connect after %d retries", maxRetries)
         return False
 
     def disconnect(self):
         """
-        Gracefully stops all threads, disconnects, and cleans up resources.
+        Gracefully stops the event loop, disconnects, and resets the received values.
+        The threads and sockets are kept for the next connect(). Call close() to release them.
         """
         self._logger.info("Stopping all threads and disconnecting")
-        self._stop = True  # Signal threads to stop
+        self._stop = True  # Signal the event loop to stop
+
+        # Wake up the event loop, and wait for it to go idle
+        self._wakeup()
+        self._idle_event.wait()
+        # Let the parser thread finish the packets already queued, before the values are reset
+        if self._parse_q is not None:
+            self._parse_q.join()
 
-        # Close the socket to unblock any recvfrom() calls
-        if self._socket:
-            try:
-                self._socket.close()
-            except Exception as e:
-                self._logger.error(f"Error closing socket: {e}")
-
-        # Wait for threads to finish, if they're still alive
-        if self._recv_thread.is_alive():
-            self._recv_thread.join()
-        if self._conn_thread.is_alive():
-            self._conn_thread.join()
-        if self._g_info_thread.is_alive():
-            self._g_info_thread.join()
-        if self._g_att_thread.is_alive():
-            self._g_att_thread.join()
-
-        # Reset the stop flag and other variables
         self.resetVars()
-        self._stop = False
+
+    def close(self):
+        """
+        Disconnects, ends the event loop and parser threads, and closes the sockets.
+        The object can not be connected again after it is closed.
+        """
+        if self._closed:
+            return
+        self.disconnect()
+        self._closed = True
+
+        # Wake up the idle loop thread, it exits when it sees the closed flag
+        self._run_event.set()
+        if self._loop_thread.is_alive():
+            self._loop_thread.join()
+        if self._parse_thread is not None and self._parse_thread.is_alive():
+            self._parse_q.put(None)
+            self._parse_thread.join()
+
+        self._sel.close()
+        if self._uring is not None:
+            self._uring.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def checkConnection(self):
         """
         Checks if there is a live connection to the camera by requesting the Firmware version.
-        Runs in a thread at a defined frequency.
+        Blocks for 0.1 second while waiting for the reply. Can be called from any thread, except the event loop.
         """
-        try:
-            self.requestFirmwareVersion()
-            sleep(0.1)
-            if self._fw_msg.seq != self._last_fw_seq and len(self._fw_msg.gimbal_firmware_ver) > 0:
-                self._connected = True
-                self._last_fw_seq = self._fw_msg.seq
-            else:
-                self._connected = False
-        except Exception as e:
-            self._logger.error(f"Connection check failed: {e}")
-            self.disconnect()
+        self.requestFirmwareVersion()
+        sleep(0.1)
+        self._updateConnection()
 
-    def connectionLoop(self, t):
+    def _checkConnectionTick(self):
         """
-        Periodically checks connection status and resets state if disconnected.
-
-        Params
-        --
-        - t [float]: message frequency in seconds
+        Periodic connection check, run by the event loop. The reply is checked 0.1 second later, by a timer.
         """
-        while not self._stop:
-            try:
-                self.checkConnection()
-                sleep(t)
-            except Exception as e:
-                self._logger.error(f"Error in connection loop: {e}")
-                self.disconnect()
-                break
+        self.requestFirmwareVersion()
+        self._addTimer(0.1, self._updateConnection)
 
-    # def recvLoop(self):
-    #     """
-    #     Continuously receives data from the camera.
-    #     """
-    #     try:
-    #         while not self._stop:
-    #             try:
-    #                 data, addr = self._socket.recvfrom(self._BUFF_SIZE)
-    #                 if self._stop:
-    #                     break
-    #                 # Process the received data here...
-    #             except socket.timeout:
-    #                 # If stopping, exit without logging
-    #                 if self._stop:
-    #                     break
-    #                 # Otherwise, continue waiting
-    #                 continue
-    #             except OSError:
-    #                 # Socket closed, exit loop
-    #                 break
-    #     except Exception as e:
-    #         self._logger.error(f"Error in receive loop: {e}")
-    #     finally:
-    #         self._logger.info("Exiting recvLoop")
+    def _updateConnection(self):
+        """
+        Sets the connection state from the reply to the last firmware version request
+        """
+        if self._fw_msg.seq != self._last_fw_seq and len(self._fw_msg.gimbal_firmware_ver) > 0:
+            self._connected = True
+            self._last_fw_seq = self._fw_msg.seq
+        else:
+            self._connected = False
 
     def isConnected(self):
         return self._connected
 
-    def gimbalInfoLoop(self, t):
+    def _gimbalInfoTick(self):
+        """
+        Periodically requests gimbal info, once connected.
+        """
+        if self._connected:
+            self.requestGimbalInfo()
+
+    def _gimbalAttTick(self):
+        """
+        Periodically requests gimbal attitude, once connected.
+        """
+        if self._connected:
+            self.requestGimbalAttitude()
+
+    def _addTimer(self, delay, callback, period=None):
         """
-        Periodically requests gimbal info.
+        Schedules a callback in the event loop. Must be called before the loop starts, or from the loop itself.
 
         Params
         --
-        - t [float]: message frequency in seconds
+        - delay [float]: time from now, in seconds
+        - callback [function]: function to call
+        - period [float]: repeat period in seconds. None for a one-shot timer
         """
-        while not self._stop:
+        self._timer_id += 1
+        heapq.heappush(self._timers, [monotonic()+delay, self._timer_id, period, callback])
+
+    def _startTimers(self):
+        """
+        Seeds the event loop with the periodic requests
+        """
+        self._timers = []
+        self._addTimer(0, self._checkConnectionTick, self._conn_loop_rate)
+        self._addTimer(0, self._gimbalInfoTick, self._gimbal_info_loop_rate)
+        self._addTimer(0, self._gimbalAttTick, self._gimbal_att_loop_rate)
+
+    def _startLoop(self):
+        """
+        Starts a new run of the event loop, and starts its thread if needed.
+        Does nothing if the loop is already running, as its timers belong to the loop thread.
+        """
+        if self._closed:
+            raise RuntimeError("SIYISDK is closed")
+        if not self._idle_event.is_set():
+            # Running, or started and not yet running
+            return
+        self._stop = False
+        self._debug_enabled = self._logger.isEnabledFor(logging.DEBUG)
+        self._startTimers()
+        self._idle_event.clear()
+        self._run_event.set()
+        if not self._loop_thread.is_alive():
+            self._loop_thread.start()
+        if self._parse_thread is not None and not self._parse_thread.is_alive():
+            self._parse_thread.start()
+
+    def _loopThread(self):
+        """
+        Body of the event loop thread. Runs the event loop between connect() and disconnect(), and idles otherwise
+        """
+        while True:
+            self._run_event.wait()
+            self._run_event.clear()
+            if self._closed:
+                return
+            try:
+                self.eventLoop()
+            finally:
+                self._idle_event.set()
+
+    def _parseLoop(self):
+        """
+        Body of the parser thread. Decodes the queued packets and runs their parse functions
+        """
+        parse_q = self._parse_q
+        handle = self._handlePacket
+        while True:
+            packet = parse_q.get()
+            if packet is None:
+                # Sent by close()
+                parse_q.task_done()
+                return
             try:
-                self.requestGimbalInfo()
-                sleep(t)
+                # The CRC16 was checked by the event loop, before queueing
+                handle(packet, True)
             except Exception as e:
-                self._logger.error(f"Error in gimbal info loop: {e}")
-                self.disconnect()
+                self._logger.error("Error in parser thread: %s", e)
+            finally:
+                parse_q.task_done()
 
-    def gimbalAttLoop(self, t):
+    def _handlePacket(self, packet: bytes, crc_checked: bool = False) -> bool:
         """
-        Periodically requests gimbal attitude.
+        Decodes one packet, checks its data length, and runs its parse function.
+        Called by bufferCallback(), or by the parser thread when it is enabled.
 
         Params
         --
-        - t [float]: message frequency in seconds
+        - packet [bytes] Full message bytes (header to CRC16)
+        - crc_checked [bool] The CRC16 is already checked, and is not computed again
+
+        Returns
+        --
+        [bool] False if the packet could not be decoded (invalid CRC16), True otherwise
         """
-        while not self._stop:
+        val = self._in_msg.decodeBytes(packet, not crc_checked)
+        if val is None:
+            return False
+
+        data, data_len, cmd_id, seq = val
+        if data_len < _MIN_DATA_LEN.get(cmd_id, 0):
+            self._logger.error("Message %02x is too short: %d data bytes", cmd_id, data_len)
+            return True
+
+        handler = self._dispatch.get(cmd_id)
+        if handler is None:
+            self._logger.warning("CMD ID is not recognized")
+            return True
+        # The data length is checked above. This only catches unexpected errors
+        try:
+            handler(data, seq)
+        except Exception as e:
+            self._logger.error("Error parsing message %02x: %s", cmd_id, e)
+        return True
+
+    def _wakeup(self):
+        """
+        Interrupts the event loop select()
+        """
+        try:
+            self._wake_w.send(b'\x00')
+        except (BlockingIOError, OSError):
+            # Already has a pending wake-up
+            pass
+
+    def _onWake(self):
+        try:
+            while self._wake_r.recv(64):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def eventLoop(self) -> None:
+        """
+        Receives data from the camera when the socket is readable, and runs the timers of the periodic requests.
+        """
+        self._logger.debug("Started event loop")
+        timers = self._timers
+        flush = self._flushTx
+        select = self._sel.select
+        heappop, heappush = heapq.heappop, heapq.heappush
+        self._loop_running = True
+        try:
+            while not self._stop:
+                flush()
+
+                timeout = None
+                if timers:
+                    timeout = max(0.0, timers[0][0] - monotonic())
+                for key, _ in select(timeout):
+                    key.data()
+
+                now = monotonic()
+                while timers and timers[0][0] <= now and not self._stop:
+                    timer = heappop(timers)
+                    deadline, _, period, callback = timer
+                    if period is not None:
+                        # Keep a fixed rate, unless we are late by more than one period
+                        timer[0] = deadline+period if deadline+period > now else now+period
+                        heappush(timers, timer)
+                    try:
+                        callback()
+                    except Exception as e:
+                        self._logger.error("Error in event loop: %s", e)
+        except Exception as e:
+            # e.g. the socket or the io_uring ring failed. Nothing is received any more
+            self._logger.error("Event loop stopped on error: %s", e)
+            self._connected = False
+        finally:
+            # Sends go directly to the socket from now on
+            with self._tx_lock:
+                self._loop_running = False
+        # Messages queued before stopping are still sent
+        self._flushTx()
+        self._logger.debug("Exiting event loop")
+
+    def _flushTx(self) -> None:
+        """
+        Sends the queued outgoing messages. Runs in the event loop.
+        Messages queued together are coalesced into one datagram, as the camera parses frames back to back.
+        """
+        tx_q = self._tx_q
+        if not tx_q:
+            return
+        popleft = tx_q.popleft
+        zc = self._zc_sender
+        if zc is not None:
+            zc.reap()
+            sendto = zc.send
+        else:
+            sendto = self._socket.sendto
+        max_size = self._TX_MAX_DATAGRAM
+        addr = (self._server_ip, self._port)
+        while tx_q:
+            # Only the event loop pops, so peeking at tx_q[0] is safe
+            pending = [popleft()]
+            size = len(pending[0])
+            while tx_q and size+len(tx_q[0]) <= max_size:
+                msg = popleft()
+                pending.append(msg)
+                size += len(msg)
             try:
-                self.requestGimbalAttitude()
-                sleep(t)
+                sendto(b''.join(pending), addr)
             except Exception as e:
-                self._logger.error(f"Error in gimbal attitude loop: {e}")
-                self.disconnect()
+                self._logger.error("Could not send bytes: %s", e)
 
     def sendMsg(self, msg):
         """
@@ -278,14 +666,39 @@ class SIYISDK:
 
         Params
         --
-        msg [str] Message to send
+        msg [str] Message to send, in hex
         """
-        b = bytes.fromhex(msg)
+        return self.sendMsgBytes(bytes.fromhex(msg))
+
+    def sendMsgBytes(self, msg: bytes) -> bool:
+        """
+        Sends a message to the camera.
+        While the event loop runs, the message is queued and sent by the loop thread.
+
+        Params
+        --
+        msg [bytes] Message to send
+
+        Returns
+        --
+        [bool] True if the message was sent, or queued. Errors of queued sends are only logged, by the event loop
+        """
+        if not msg:
+            self._logger.error("Could not send empty message")
+            return False
+        with self._tx_lock:
+            queued = self._loop_running
+            if queued:
+                self._tx_q.append(msg)
+        if queued:
+            if threading.current_thread() is not self._loop_thread:
+                self._wakeup()
+            return True
         try:
-            self._socket.sendto(b, (self._server_ip, self._port))
+            self._socket.sendto(msg, (self._server_ip, self._port))
             return True
         except Exception as e:
-            self._logger.error("Could not send bytes")
+            self._logger.error("Could not send bytes: %s", e)
             return False
 
     def rcvMsg(self):
@@ -296,126 +709,147 @@ class SIYISDK:
             self._logger.warning("%s. Did not receive message within %s second(s)", e, self._rcv_wait_t)
         return data
 
-    def recvLoop(self):
-        self._logger.debug("Started data receiving thread")
-        while( not self._stop):
-            self.bufferCallback()
-        self._logger.debug("Exiting data receiving thread")
-
-    
-    def bufferCallback(self):
+    def _onReadable(self) -> None:
         """
-        Receives messages and parses its content
+        Receives all the datagrams queued on the socket, and parses them
         """
+        if self._zc_sender is not None:
+            # Zero-copy completions also make the socket readable
+            self._zc_sender.reap()
+        if self._rx_batch is None:
+            try:
+                nbytes = self._socket.recv_into(self._rx_buf)
+            except Exception as e:
+                self._logger.error("[_onReadable] %s", e)
+                return
+            self.bufferCallback(self._rx_buf, nbytes)
+            return
+
         try:
-            buff,addr = self._socket.recvfrom(self._BUFF_SIZE)
+            batch = self._rx_batch.recv(self._socket)
         except Exception as e:
-            self._logger.error(f"[bufferCallback] {e}")
+            self._logger.error("[_onReadable] %s", e)
             return
+        cb = self.bufferCallback
+        for buf, nbytes in batch:
+            cb(buf, nbytes)
 
-        buff_str = buff.hex()
-        self._logger.debug("Buffer: %s", buff_str)
+    def bufferCallback(self, rx_buf: bytearray, nbytes: int) -> None:
+        """
+        Parses the content of received messages
 
+        Params
+        --
+        - rx_buf [bytearray] Buffer holding the received datagram
+        - nbytes [int] Number of received bytes in rx_buf
+        """
+        # Parse in place from the receive buffer. Copy only when an incomplete packet
+        # from the previous datagram is pending at the front of the parse buffer
+        pending = self._parse_buf
+        if pending and rx_buf.startswith(b'\x55\x66', 0, nbytes):
+            # The datagram starts with a new packet, so the pending one was truncated, or its header was false.
+            # Parse the packets that may follow it, and do not wait for the rest of it
+            self._parseFrames(pending, len(pending), True)
+            pending.clear()
+        if pending:
+            pending += memoryview(rx_buf)[:nbytes]
+            buff = pending
+            n = len(pending)
+        else:
+            buff = rx_buf
+            n = nbytes
+        if self._debug_enabled:
+            self._logger.debug("Buffer: %s", buff[:n].hex())
+
+        i = self._parseFrames(buff, n, False)
+
+        if buff is pending:
+            # Drop the consumed bytes
+            del pending[:i]
+        elif i < n:
+            # Keep the incomplete packet for the next datagram
+            pending += memoryview(rx_buf)[i:n]
+
+    def _parseFrames(self, buff: bytearray, n: int, flush: bool) -> int:
+        """
+        Extracts and parses the packets in buff[:n]
+
+        Params
+        --
+        - buff [bytearray] Received bytes
+        - n [int] Number of bytes to parse in buff
+        - flush [bool] No more bytes will follow. An incomplete packet is skipped like an invalid one
+
+        Returns
+        --
+        [int] Number of consumed bytes. The rest is the start of an incomplete packet
+        """
         # 10 bytes: STX+CTRL+Data_len+SEQ+CMD_ID+CRC16
         #            2 + 1  +    2   + 2 +   1  + 2
-        MINIMUM_DATA_LENGTH=10*2
+        MINIMUM_DATA_LENGTH=10
 
-        HEADER='5566'
-        # Go through the buffer
-        while(len(buff_str)>=MINIMUM_DATA_LENGTH):
-            if buff_str[0:4]!=HEADER:
-                # Remove the 1st element and continue 
-                tmp=buff_str[1:]
-                buff_str=tmp
-                continue
+        HEADER=b'\x55\x66'
+        # Hot attributes, bound once per call
+        startswith = buff.startswith
+        find = buff.find
+        unpack_len = _U16LE.unpack_from
+        handle = self._handlePacket
+        max_len = self._BUFF_SIZE
+        parse_q = self._parse_q
 
-            # Now we got minimum amount of data. Check if we have enough
-            # Data length, bytes are reversed, according to SIYI SDK
-            low_b = buff_str[6:8] # low byte
-            high_b = buff_str[8:10] # high byte
-            data_len = high_b+low_b
-            data_len = int('0x'+data_len, base=16)
-            char_len = data_len*2
-
-            # Check if there is enough data (including payload)
-            if(len(buff_str) < (MINIMUM_DATA_LENGTH+char_len)):
-                # No useful data
-                buff_str=''
-                break
-            
-            packet = buff_str[0:MINIMUM_DATA_LENGTH+char_len]
-            buff_str = buff_str[MINIMUM_DATA_LENGTH+char_len:]
-
-            # Finally decode the packet!
-            val = self._in_msg.decodeMsg(packet)
-            if val is None:
-                continue
-            
-            data, data_len, cmd_id, seq = val[0], val[1], val[2], val[3]
-
-            if cmd_id==COMMAND.ACQUIRE_FW_VER:
-                #print("-Firmware version")
-                self.parseFirmwareMsg(data, seq)
-            elif cmd_id==COMMAND.ACQUIRE_HW_ID:
-                #print("-Hardware ID")
-                self.parseHardwareIDMsg(data, seq)
-            elif cmd_id==COMMAND.ACQUIRE_GIMBAL_INFO:
-                #print("-Gimbal info")
-                self.parseGimbalInfoMsg(data, seq)
-            elif cmd_id==COMMAND.ACQUIRE_GIMBAL_ATT:
-                #print("Gimbal attitude")
-                self.parseAttitudeMsg(data, seq)
-            elif cmd_id==COMMAND.FUNC_FEEDBACK_INFO:
-                #print("-Function feedback")
-                self.parseFunctionFeedbackMsg(data, seq)
-            elif cmd_id==COMMAND.GIMBAL_SPEED:
-                #print("-Gimbal speed")
-                self.parseGimbalSpeedMsg(data, seq)
-            elif cmd_id==COMMAND.AUTO_FOCUS:
-                #print("-Auto focus")
-                self.parseAutoFocusMsg(data, seq)
-            elif cmd_id==COMMAND.MANUAL_FOCUS:
-                #print("-Manual focus")
-                self.parseManualFocusMsg(data, seq)
-            elif cmd_id==COMMAND.MANUAL_ZOOM:
-                #print("-Manual zoom")
-                self.parseZoomMsg(data, seq)
-            elif cmd_id==COMMAND.CENTER:
-                #print("-Center")
-                self.parseGimbalCenterMsg(data, seq)
-            elif cmd_id==COMMAND.SET_GIMBAL_ATTITUDE:
-                #print("-Set gimbal attitude")
-                self.parseSetGimbalAnglesMsg(data, seq)
-            elif cmd_id==COMMAND.SET_DATA_STREAM:
-                #print("-Set data stream")
-                self.parseRequestStreamMsg()
-            elif cmd_id==COMMAND.CURRENT_ZOOM_VALUE:
-                #print("-Current zoom value")
-                self.parseCurrentZoomLevelMsg(data, seq)
-            elif cmd_id==COMMAND.REQUEST_TEMPERATURE_AT_POINT:
-                #print("-Request temperature at point")
-                self.parseTemperatureAtPointMsg(data, seq)
-            elif cmd_id==COMMAND.GIMBAL_CAMERA_SOFT_RESTART:
-                #print("-Gimbal camera soft restart")
-                self.parseGimbalCameraSoftRestartMsg(data, seq)
-            elif cmd_id==COMMAND.REQUEST_GIMBAL_CAMERA_CODEC_SPECS:
-                #print("-Request gimbal camera codec specs")
-                self.parseRequestGimbalCameraCodecSpecsMsg(data, seq)
-            elif cmd_id==COMMAND.SEND_CODEC_SPECS_TO_GIMBAL_CAMERA:
-                #print("-Send codec specs to gimbal camera")
-                self.parseSendGimbalCameraCodecSpecsMsg(data, seq)
-            elif cmd_id==COMMAND.REQUEST_GIMBAL_CAMERA_IMAGE_MODE:
-                #print("-Request gimbal camera image mode")
-                self.parseRequestGimbalCameraImageModeMsg(data, seq)
-                #print("-Send gimbal camera image mode")
-                self.parseSendGimbalCameraImageModeMsg(data, seq)
-            elif cmd_id==COMMAND.ABSOLUTE_ZOOM:
-                #print("-Absolute zoom")
-                self.parseRequestAbsoluteZoomMsg(data, seq)
-            else:
-                self._logger.warning("CMD ID is not recognized")
-        
-        return
+        # Go through the buffer
+        i = 0
+        with memoryview(buff) as mv:
+            while(n-i >= MINIMUM_DATA_LENGTH):
+                if not startswith(HEADER, i, n):
+                    # Jump to the next header, keep the last byte as it can be the start of a header
+                    i = find(HEADER, i+1, n)
+                    if i<0:
+                        i = n-1
+                    continue
+
+                # Data length, bytes are reversed, according to SIYI SDK
+                data_len, = unpack_len(buff, i+3)
+                packet_len = MINIMUM_DATA_LENGTH+data_len
+                if packet_len > max_len:
+                    # Not a real header
+                    i += 1
+                    continue
+
+                # Check if there is enough data (including payload)
+                if(n-i < packet_len):
+                    if flush:
+                        i += 1
+                        continue
+                    # Wait for the rest of the packet
+                    break
+
+                packet = bytes(mv[i:i+packet_len])
+
+                if parse_q is not None:
+                    # Leave decoding to the parser thread. The CRC16 is checked here,
+                    # so a false header is skipped like below, and the parser thread does not check it again
+                    if crc16(packet[:-2]) != unpack_len(packet, packet_len-2)[0]:
+                        i += 1
+                        continue
+                    i += packet_len
+                    try:
+                        parse_q.put_nowait(packet)
+                    except queue.Full:
+                        self._parse_dropped += 1
+                        if self._parse_dropped % 100 == 1:
+                            self._logger.warning("Parser queue is full, %d packets dropped so far", self._parse_dropped)
+                    continue
+
+                # Finally decode the packet!
+                if not handle(packet):
+                    # Not a valid frame, e.g. a false header or a truncated frame.
+                    # Look for the next header inside it, instead of skipping the claimed length
+                    i += 1
+                    continue
+                i += packet_len
+
+        return i
     
     ##################################################
     #               Request functions                #
@@ -428,10 +862,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.firmwareVerMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_fw)
 
     def requestHardwareID(self):
         """
@@ -441,10 +872,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.hwIdMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_hw_id)
 
     def requestGimbalAttitude(self):
         """
@@ -454,10 +882,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.gimbalAttMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_att)
 
     def requestGimbalInfo(self):
         """
@@ -467,10 +892,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.gimbalInfoMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_info)
 
     def requestFunctionFeedback(self):
         """
@@ -480,10 +902,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.funcFeedbackMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_func_feedback)
 
     def requestAutoFocus(self):
         """
@@ -493,10 +912,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.autoFocusMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_auto_focus)
 
     def requestZoomIn(self):
         """
@@ -506,10 +922,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.zoomInMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_zoom_in)
 
     def requestZoomOut(self):
         """
@@ -519,10 +932,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.zoomOutMsg()
-        if not self.sendMsg(msg):
-            return False
-        return True
+        return self.sendMsgBytes(self._pkt_zoom_out)
 
     def requestZoomHold(self):
         """
@@ -532,46 +942,42 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.stopZoomMsg()
-        
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_stop_zoom)
     
     def requestAbsoluteZoom(self, level: float):
         msg = self._out_msg.absoluteZoomMsg(level)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def requestCurrentZoomLevel(self):
-        msg = self._out_msg.requestCurrentZoomMsg()
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_zoom)
     
     def requestTemperatureAtPoint(self, x: int, y: int, get_temp_flag: int):
         msg = self._out_msg.requestTemperatureAtPointMsg(x, y, get_temp_flag)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def requestGimbalCameraSoftRestart(self, camera_reboot: int, gimbal_reboot: int):
         msg = self._out_msg.gimbalCameraSoftRestartMsg(camera_reboot, gimbal_reboot)
         #print("Gimbal camera soft restart msg: %s", msg)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def requestGimbalCameraCodecSpecs(self, stream_type: int):
         msg = self._out_msg.requestGimbalCameraCodecSpecsMsg(stream_type)
         #print("Request gimbal camera codec specs msg: %s", msg)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def sendGimbalCameraCodecSpecs(self, stream_type: int, video_enc_type: int, resolution_l: int, resolution_h: int, video_bitrate: int):
         msg = self._out_msg.sendGimbalCameraCodecSpecsMsg(stream_type, video_enc_type, resolution_l, resolution_h, video_bitrate)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def requestGimbalCameraImageMode(self):
-        if self._hw_msg.cam_type_str == 'ZT6' or self._hw_msg.cam_type_str == 'ZT30':
-            msg = self._out_msg.requestGimbalCameraImageModeMsg()
-            return self.sendMsg(msg)
+        if self._hw_msg.cam_type in (cameras.CamType.ZT6, cameras.CamType.ZT30):
+            return self.sendMsgBytes(self._pkt_image_mode)
         else:
             self._logger.warning("Camera not supported for ImageMode.")
             return False
     def sendGimbalCameraImageMode(self, vdisp_mode: int):
         msg = self._out_msg.sendGimbalCameraImageModeMsg(vdisp_mode)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
 
     def requestLongFocus(self):
         """
@@ -581,9 +987,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.longFocusMsg()
-        
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_long_focus)
 
     def requestCloseFocus(self):
         """
@@ -593,9 +997,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.closeFocusMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_close_focus)
 
     def requestFocusHold(self):
         """
@@ -605,9 +1007,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.stopFocusMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_stop_focus)
 
     def requestCenterGimbal(self):
         """
@@ -617,9 +1017,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.centerMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_center)
 
     def requestGimbalSpeed(self, yaw_speed:int, pitch_speed:int):
         """
@@ -636,7 +1034,7 @@ class SIYISDK:
         """
         msg = self._out_msg.gimbalSpeedMsg(yaw_speed, pitch_speed)
 
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
 
     def requestPhoto(self):
         """
@@ -646,9 +1044,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.takePhotoMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_photo)
 
     def requestRecording(self):
         """
@@ -658,9 +1054,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.recordMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_record)
 
     def requestFPVMode(self):
         """
@@ -670,9 +1064,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.fpvModeMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_fpv_mode)
 
     def requestLockMode(self):
         """
@@ -682,9 +1074,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.lockModeMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_lock_mode)
 
     def requestFollowMode(self):
         """
@@ -694,9 +1084,7 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        msg = self._out_msg.followModeMsg()
-
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(self._pkt_follow_mode)
     
     def requestSetAngles(self, yaw_deg:float, pitch_deg:float):
         """
@@ -706,58 +1094,28 @@ class SIYISDK:
         --
         [bool] True: success. False: fail
         """
-        if self._hw_msg.cam_type_str == '':
-            self._logger.error(f"Gimbal type is not yet retrieved. Check connection.")
+        if self._hw_msg.cam_type == cameras.CamType.UNKNOWN:
+            self._logger.error("Gimbal type is not yet retrieved. Check connection.")
             return False
         
-        if self._hw_msg.cam_type_str == 'A8 mini':
-            if yaw_deg > cameras.A8MINI.MAX_YAW_DEG:
-                self._logger.warning(f"yaw_deg {yaw_deg} exceeds max {cameras.A8MINI.MAX_YAW_DEG}. Setting it to max")
-                yaw_deg = cameras.A8MINI.MAX_YAW_DEG
-            if yaw_deg < cameras.A8MINI.MIN_YAW_DEG:
-                self._logger.warning(f"yaw_deg {yaw_deg} exceeds min {cameras.A8MINI.MIN_YAW_DEG}. Setting it to min")
-                yaw_deg = cameras.A8MINI.MIN_YAW_DEG
-            if pitch_deg > cameras.A8MINI.MAX_PITCH_DEG:
-                self._logger.warning(f"pitch_deg {pitch_deg} exceeds max {cameras.A8MINI.MAX_PITCH_DEG}. Setting it to max")
-                pitch_deg = cameras.A8MINI.MAX_PITCH_DEG
-            if pitch_deg < cameras.A8MINI.MIN_PITCH_DEG:
-                self._logger.warning(f"pitch_deg {pitch_deg} exceeds min {cameras.A8MINI.MIN_PITCH_DEG}. Setting it to min")
-                pitch_deg = cameras.A8MINI.MIN_PITCH_DEG
-
-        elif self._hw_msg.cam_type_str == 'ZR10':
-            if yaw_deg > cameras.ZR10.MAX_YAW_DEG:
-                self._logger.warning(f"yaw_deg {yaw_deg} exceeds max {cameras.ZR10.MAX_YAW_DEG}. Setting it to max")
-                yaw_deg = cameras.ZR10.MAX_YAW_DEG
-            if yaw_deg < cameras.ZR10.MIN_YAW_DEG:
-                self._logger.warning(f"yaw_deg {yaw_deg} exceeds min {cameras.ZR10.MIN_YAW_DEG}. Setting it to min")
-                yaw_deg = cameras.ZR10.MIN_YAW_DEG
-            if pitch_deg > cameras.ZR10.MAX_PITCH_DEG:
-                self._logger.warning(f"pitch_deg {pitch_deg} exceeds max {cameras.ZR10.MAX_PITCH_DEG}. Setting it to max")
-                pitch_deg = cameras.ZR10.MAX_PITCH_DEG
-            if pitch_deg < cameras.ZR10.MIN_PITCH_DEG:
-                self._logger.warning(f"pitch_deg {pitch_deg} exceeds min {cameras.ZR10.MIN_PITCH_DEG}. Setting it to min")
-                pitch_deg = cameras.ZR10.MIN_PITCH_DEG
-
-        elif self._hw_msg.cam_type_str == 'ZT6':
-            if yaw_deg > cameras.ZT6.MAX_YAW_DEG:
-                self._logger.warning(f"yaw_deg {yaw_deg} exceeds max {cameras.ZT6.MAX_YAW_DEG}. Setting it to max")
-                yaw_deg = cameras.ZT6.MAX_YAW_DEG
-            if yaw_deg < cameras.ZT6.MIN_YAW_DEG:
-                self._logger.warning(f"yaw_deg {yaw_deg} exceeds min {cameras.ZT6.MIN_YAW_DEG}. Setting it to min")
-                yaw_deg = cameras.ZT6.MIN_YAW_DEG
-            if pitch_deg > cameras.ZT6.MAX_PITCH_DEG:
-                self._logger.warning(f"pitch_deg {pitch_deg} exceeds max {cameras.ZT6.MAX_PITCH_DEG}. Setting it to max")
-                pitch_deg = cameras.ZT6.MAX_PITCH_DEG
-            if pitch_deg < cameras.ZT6.MIN_PITCH_DEG:
-                self._logger.warning(f"pitch_deg {pitch_deg} exceeds min {cameras.ZR10.MIN_PITCH_DEG}. Setting it to min")
-                pitch_deg = cameras.A8MINI.MIN_PITCH_DEG
-        else:
-            self._logger.warning(f"Camera not supported. Setting angles to zero")
+        lim = self._angle_limits.get(self._hw_msg.cam_type)
+        if lim is None:
+            self._logger.warning("Camera not supported. Setting angles to zero")
             return False
+        min_yaw, max_yaw, min_pitch, max_pitch = lim
+
+        yaw_sp = max(min_yaw, min(max_yaw, yaw_deg))
+        if yaw_sp != yaw_deg:
+            self._logger.warning("yaw_deg %s exceeds limits [%s, %s]. Setting it to %s", yaw_deg, min_yaw, max_yaw, yaw_sp)
+            yaw_deg = yaw_sp
+        pitch_sp = max(min_pitch, min(max_pitch, pitch_deg))
+        if pitch_sp != pitch_deg:
+            self._logger.warning("pitch_deg %s exceeds limits [%s, %s]. Setting it to %s", pitch_deg, min_pitch, max_pitch, pitch_sp)
+            pitch_deg = pitch_sp
 
         msg = self._out_msg.setGimbalAttitude(int(yaw_deg*10), int(pitch_deg*10))
 
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def requestDataStreamAttitude(self, freq: int):
         """
@@ -768,7 +1126,7 @@ class SIYISDK:
         freq: [uint_8] frequency in Hz (0, 2, 4, 5, 10, 20, 50, 100)
         """
         msg = self._out_msg.dataStreamMsg(1, freq)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
     
     def requestDataStreamLaser(self, freq: int):
         """
@@ -779,38 +1137,39 @@ class SIYISDK:
         freq: [uint_8] frequency in Hz (0, 2, 4, 5, 10, 20, 50, 100)
         """
         msg = self._out_msg.dataStreamMsg(2, freq)
-        return self.sendMsg(msg)
+        return self.sendMsgBytes(msg)
 
     ####################################################
     #                Parsing functions                 #
     ####################################################
-    def parseFirmwareMsg(self, msg:str, seq:int):
+    def parseFirmwareMsg(self, msg:bytes, seq:int):
         try:
-            self._fw_msg.gimbal_firmware_ver= msg[8:16]
+            self._fw_msg.gimbal_firmware_ver= msg[4:8].hex()
             self._fw_msg.seq=seq
             
-            self._logger.debug("Firmware version: %s", self._fw_msg.gimbal_firmware_ver)
+            if self._debug_enabled:
+                self._logger.debug("Firmware version: %s", self._fw_msg.gimbal_firmware_ver)
 
             return True
         except Exception as e:
             self._logger.error("Error %s", e)
             return False
 
-    def parseHardwareIDMsg(self, msg:str, seq:int):
+    def parseHardwareIDMsg(self, msg:bytes, seq:int):
         try:
             
             self._hw_msg.seq=seq
-            self._hw_msg.id = msg
 
-            in_ascii = bytes.fromhex(msg).decode('ascii')[:10]
+            in_ascii = msg.decode('ascii')[:10]
             self._hw_msg.id = in_ascii
             
             # first two characters define the camera ID
             cam_id = in_ascii[:2]
             try:
                 self._hw_msg.cam_type_str = self._hw_msg.CAM_DICT[cam_id]
+                self._hw_msg.cam_type = self._hw_msg.CAM_TYPE_DICT[cam_id]
             except Exception as e:
-                self._logger.error(f"Camera not recognized. Key: {cam_id}")
+                self._logger.error("Camera not recognized. Key: %s", cam_id)
                 self._logger.error("Camera not recognized Error %s", e)
 
             return True
@@ -818,295 +1177,205 @@ class SIYISDK:
             self._logger.error("Error %s", e)
             return False
 
-    def parseAttitudeMsg(self, msg:str, seq:int):
+    def parseAttitudeMsg(self, msg:bytes, seq:int) -> bool:
         
-        try:
-            self._att_msg.seq=seq
-            self._att_msg.yaw = toInt(msg[2:4]+msg[0:2]) /10.
-            self._att_msg.pitch = toInt(msg[6:8]+msg[4:6]) /10.
-            self._att_msg.roll = toInt(msg[10:12]+msg[8:10]) /10.
-            self._att_msg.yaw_speed = toInt(msg[14:16]+msg[12:14]) /10.
-            self._att_msg.pitch_speed = toInt(msg[18:20]+msg[16:18]) /10.
-            self._att_msg.roll_speed = toInt(msg[22:24]+msg[20:22]) /10.
-
+        # 6 x int16, little endian
+        yaw, pitch, roll, yaw_speed, pitch_speed, roll_speed = _ATTITUDE.unpack_from(msg)
+        self._att_msg.seq=seq
+        self._att_msg.yaw = yaw /10.
+        self._att_msg.pitch = pitch /10.
+        self._att_msg.roll = roll /10.
+        self._att_msg.yaw_speed = yaw_speed /10.
+        self._att_msg.pitch_speed = pitch_speed /10.
+        self._att_msg.roll_speed = roll_speed /10.
+        # Event.set() takes a lock and notifies. Only call it when setGimbalRotation() cleared the event
+        if not self._att_event.is_set():
+            self._att_event.set()
+
+        if self._debug_enabled:
             self._logger.debug("(yaw, pitch, roll= (%s, %s, %s)", 
                                     self._att_msg.yaw, self._att_msg.pitch, self._att_msg.roll)
             self._logger.debug("(yaw_speed, pitch_speed, roll_speed= (%s, %s, %s)", 
                                     self._att_msg.yaw_speed, self._att_msg.pitch_speed, self._att_msg.roll_speed)
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseGimbalInfoMsg(self, msg:str, seq:int):
-        try:
-            self._record_msg.seq=seq
-            self._mountDir_msg.seq=seq
-            self._motionMode_msg.seq=seq
-            
-            self._record_msg.state = int('0x'+msg[6:8], base=16)
-            self._motionMode_msg.mode = int('0x'+msg[8:10], base=16)
-            self._mountDir_msg.dir = int('0x'+msg[10:12], base=16)
+    def parseGimbalInfoMsg(self, msg:bytes, seq:int) -> bool:
+        self._record_msg.seq=seq
+        self._mountDir_msg.seq=seq
+        self._motionMode_msg.seq=seq
+        
+        # Bytes 3, 4, 5: recording state, motion mode, mounting direction
+        self._record_msg.state, self._motionMode_msg.mode, self._mountDir_msg.dir = _GIMBAL_INFO.unpack_from(msg, 3)
 
+        if self._debug_enabled:
             self._logger.debug("Recording state %s", self._record_msg.state)
             self._logger.debug("Mounting direction %s", self._mountDir_msg.dir)
             self._logger.debug("Gimbal motion mode %s", self._motionMode_msg.mode)
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
-    def parseRequestAbsoluteZoomMsg(self, msg:str, seq:int):
-        try:
-            self._request_absolute_zoom_msg.seq = seq
-            self._request_absolute_zoom_msg.success = bool(int('0x'+msg, base=16))
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseAutoFocusMsg(self, msg:str, seq:int):
-        
-        try:
-            self._autoFocus_msg.seq=seq
-            self._autoFocus_msg.success = bool(int('0x'+msg, base=16))
+    def parseRequestAbsoluteZoomMsg(self, msg:bytes, seq:int):
+        self._request_absolute_zoom_msg.seq = seq
+        self._request_absolute_zoom_msg.success = msg[0] != 0
+        return True
 
-            
+    def parseAutoFocusMsg(self, msg:bytes, seq:int):
+        self._autoFocus_msg.seq=seq
+        self._autoFocus_msg.success = msg[0] != 0
+
+        if self._debug_enabled:
             self._logger.debug("Auto focus success: %s", self._autoFocus_msg.success)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseZoomMsg(self, msg:str, seq:int):
-        
-        try:
-            self._manualZoom_msg.seq=seq
-            self._manualZoom_msg.level = int('0x'+msg[2:4]+msg[0:2], base=16) /10.
+    def parseZoomMsg(self, msg:bytes, seq:int):
+        self._manualZoom_msg.seq=seq
+        level, = _U16LE.unpack_from(msg)
+        self._manualZoom_msg.level = level /10.
 
-            
+        if self._debug_enabled:
             self._logger.debug("Zoom level %s", self._manualZoom_msg.level)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseManualFocusMsg(self, msg:str, seq:int):
-        
-        try:
-            self._manualFocus_msg.seq=seq
-            self._manualFocus_msg.success = bool(int('0x'+msg, base=16))
+    def parseManualFocusMsg(self, msg:bytes, seq:int):
+        self._manualFocus_msg.seq=seq
+        self._manualFocus_msg.success = msg[0] != 0
 
-            
+        if self._debug_enabled:
             self._logger.debug("Manual  focus success: %s", self._manualFocus_msg.success)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseGimbalSpeedMsg(self, msg:str, seq:int):
-        
-        try:
-            self._gimbalSpeed_msg.seq=seq
-            self._gimbalSpeed_msg.success = bool(int('0x'+msg, base=16))
+    def parseGimbalSpeedMsg(self, msg:bytes, seq:int):
+        self._gimbalSpeed_msg.seq=seq
+        self._gimbalSpeed_msg.success = msg[0] != 0
 
-            
+        if self._debug_enabled:
             self._logger.debug("Gimbal speed success: %s", self._gimbalSpeed_msg.success)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseGimbalCenterMsg(self, msg:str, seq:int):
-        
-        try:
-            self._center_msg.seq=seq
-            self._center_msg.success = bool(int('0x'+msg, base=16))
+    def parseGimbalCenterMsg(self, msg:bytes, seq:int):
+        self._center_msg.seq=seq
+        self._center_msg.success = msg[0] != 0
 
-            
+        if self._debug_enabled:
             self._logger.debug("Gimbal center success: %s", self._center_msg.success)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+        return True
 
-    def parseFunctionFeedbackMsg(self, msg:str, seq:int):
-        
-        try:
-            self._funcFeedback_msg.seq=seq
-            self._funcFeedback_msg.info_type = int('0x'+msg, base=16)
+    def parseFunctionFeedbackMsg(self, msg:bytes, seq:int):
+        self._funcFeedback_msg.seq=seq
+        self._funcFeedback_msg.info_type = msg[0]
 
-            
+        if self._debug_enabled:
             self._logger.debug("Function Feedback Code: %s", self._funcFeedback_msg.info_type)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
-        
-    def parseSetGimbalAnglesMsg(self, msg:str, seq:int):
-        
-        try:
-            self._set_gimbal_angles_msg.seq=seq
+        return True
 
-            # No need to parse the feedback angle as it is done by the parseAttitudeMsg() in a loop
+    def parseSetGimbalAnglesMsg(self, msg:bytes, seq:int):
+        self._set_gimbal_angles_msg.seq=seq
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
-        
-    def parseRequestStreamMsg(self, msg:str, seq:int):
-        
-        try:
-            self._request_data_stream_msg.seq=seq
+        # No need to parse the feedback angle as it is done by the parseAttitudeMsg() in a loop
 
-            self._request_data_stream_msg.data_type = int('0x'+msg, base=16)
+        return True
 
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
-        
-    def parseCurrentZoomLevelMsg(self, msg: str, seq: int):
-        try:
-            self._current_zoom_level_msg.seq = seq
-            int_part = int('0x'+msg[0:2], base=16)
-            float_part = int('0x'+msg[2:4], base=16)
-            self._current_zoom_level_msg.level = int_part + (float_part/10)
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
-    
-    def parseTemperatureAtPointMsg(self, msg:str, seq:int):
-        try:
-            self._temperature_at_point_msg.seq=seq
-            self._temperature_at_point_msg.temp = int('0x'+msg[2:4]+msg[0:2], base=16)/100.
-            self._temperature_at_point_msg.x = int('0x'+msg[6:8]+msg[4:6], base=16)
-            self._temperature_at_point_msg.y = int('0x'+msg[10:12]+msg[8:10], base=16)
-            #print(f"Temperature at point msg: {self._temperature_at_point_msg.temp}, {self._temperature_at_point_msg.x}, {self._temperature_at_point_msg.y}")
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
+    def parseRequestStreamMsg(self, msg:bytes, seq:int):
+        self._request_data_stream_msg.seq=seq
 
-    def parseGimbalCameraSoftRestartMsg(self, msg:str, seq:int):
+        self._request_data_stream_msg.data_type = msg[0]
+
+        return True
+
+    def parseCurrentZoomLevelMsg(self, msg: bytes, seq: int):
+        self._current_zoom_level_msg.seq = seq
+        int_part, float_part = _CURRENT_ZOOM.unpack_from(msg)
+        self._current_zoom_level_msg.level = int_part + (float_part/10)
+        return True
+
+    def parseTemperatureAtPointMsg(self, msg:bytes, seq:int):
+        self._temperature_at_point_msg.seq=seq
+        temp, x, y = _TEMP_AT_POINT.unpack_from(msg)
+        self._temperature_at_point_msg.temp = temp/100.
+        self._temperature_at_point_msg.x = x
+        self._temperature_at_point_msg.y = y
+        #print(f"Temperature at point msg: {self._temperature_at_point_msg.temp}, {self._temperature_at_point_msg.x}, {self._temperature_at_point_msg.y}")
+        return True
+
+    def parseGimbalCameraSoftRestartMsg(self, msg:bytes, seq:int):
         """
         Parse the gimbal camera soft restart message
         camera_reboot_status: 0: No action, 1: Camera restart; uint8_t
         gimbal_reboot_status: 0: No action, 1: Gimbal restart; uint8_t
         """
-        try:
-            self._gimbal_camera_soft_restart_msg.seq=seq
-            self._gimbal_camera_soft_restart_msg.camera_reboot_status = int('0x'+msg[0:2], base=16)
-            self._gimbal_camera_soft_restart_msg.gimbal_reboot_status = int('0x'+msg[2:4], base=16)
-            return True
-        except Exception as e:
-            self._logger.error("Error %s", e)
-            return False
-    
-    def parseRequestGimbalCameraCodecSpecsMsg(self, msg:str, seq:int):
+        self._gimbal_camera_soft_restart_msg.seq=seq
+        camera_reboot, gimbal_reboot = _SOFT_RESTART.unpack_from(msg)
+        self._gimbal_camera_soft_restart_msg.camera_reboot_status = camera_reboot
+        self._gimbal_camera_soft_restart_msg.gimbal_reboot_status = gimbal_reboot
+        return True
+
+    def parseRequestGimbalCameraCodecSpecsMsg(self, msg:bytes, seq:int):
         """
         Parse the gimbal camera codec specs request message
-        msg: hex string containing stream type
+        msg: data bytes, starting with the stream type
         seq: sequence number
-        Returns True if parsing successful, False otherwise
+        The data length is checked by _MIN_DATA_LEN before this is called
         """
-        try:
-            data_bytes = bytes.fromhex(msg)
-            stream_type, video_enc_type, res_l, res_h, bitrate, frame_rate = struct.unpack('<BBHHHB', data_bytes)
-
-            self._request_gimbal_camera_codec_specs_msg.seq = seq
-            self._request_gimbal_camera_codec_specs_msg.stream_type = stream_type
-            self._request_gimbal_camera_codec_specs_msg.video_enc_type = video_enc_type
-            self._request_gimbal_camera_codec_specs_msg.resolution_l = res_l
-            self._request_gimbal_camera_codec_specs_msg.resolution_h = res_h
-            self._request_gimbal_camera_codec_specs_msg.video_bitrate = bitrate
-            self._request_gimbal_camera_codec_specs_msg.video_framerate = frame_rate
-            #print("codec specs msg: ",self._request_gimbal_camera_codec_specs_msg)
+        stream_type, video_enc_type, res_l, res_h, bitrate, frame_rate = _CODEC_SPECS.unpack_from(msg)
 
-            return True
-        except Exception as e:
-            self._logger.error("Error parsing gimbal camera codec specs request: %s", e)
-            self._request_gimbal_camera_codec_specs_msg.sta = 0 # Failed
-            return False
+        self._request_gimbal_camera_codec_specs_msg.seq = seq
+        self._request_gimbal_camera_codec_specs_msg.stream_type = stream_type
+        self._request_gimbal_camera_codec_specs_msg.video_enc_type = video_enc_type
+        self._request_gimbal_camera_codec_specs_msg.resolution_l = res_l
+        self._request_gimbal_camera_codec_specs_msg.resolution_h = res_h
+        self._request_gimbal_camera_codec_specs_msg.video_bitrate = bitrate
+        self._request_gimbal_camera_codec_specs_msg.video_framerate = frame_rate
+        #print("codec specs msg: ",self._request_gimbal_camera_codec_specs_msg)
+
+        return True
         
-    def parseSendGimbalCameraCodecSpecsMsg(self, msg:str, seq:int):
+    def parseSendGimbalCameraCodecSpecsMsg(self, msg:bytes, seq:int):
         """
         Parses the return message from the gimbal camera codec specs send
         """
-        try:
-            self._send_gimbal_camera_codec_specs_msg.seq = seq
-            self._send_gimbal_camera_codec_specs_msg.stream_type = int('0x'+msg[0:2], base=16)
-            self._send_gimbal_camera_codec_specs_msg.sta = bool(int('0x'+msg[2:4], base=16))
-            return True
-        except Exception as e:
-            self._logger.error("Error parsing gimbal camera codec specs send: %s", e)
-            self._send_gimbal_camera_codec_specs_msg.sta = 0 # Failed
-            return False
-    
-    def parseRequestGimbalCameraImageModeMsg(self, msg: str, seq: int):
+        self._send_gimbal_camera_codec_specs_msg.seq = seq
+        stream_type, sta = _CODEC_SPECS_ACK.unpack_from(msg)
+        self._send_gimbal_camera_codec_specs_msg.stream_type = stream_type
+        self._send_gimbal_camera_codec_specs_msg.sta = bool(sta)
+        return True
+
+    def _parseImageMode(self, target_msg, msg: bytes, seq: int):
+        """
+        Parses an image mode reply into target_msg.
+
+        Params
+        --
+        - target_msg [RequestGimbalCameraImageModeMsg or SendGimbalCameraImageModeMsg] Message to update
+        - msg [bytes] ACK data (a single byte: vdisp_mode)
+        - seq [int] Sequence number of the message
+        """
+        vdisp_mode = msg[0]
+
+        target_msg.seq = seq
+        target_msg.vdisp_mode = vdisp_mode
+        target_msg.description = _IMAGE_MODE_DESCRIPTIONS[vdisp_mode] if 0 <= vdisp_mode < len(_IMAGE_MODE_DESCRIPTIONS) else "Unknown mode"
+        return True
+
+    def parseRequestGimbalCameraImageModeMsg(self, msg: bytes, seq: int):
         """
         Parse the gimbal camera image mode request message.
         
         Parameters:
-        - msg (str): Hex string of the ACK data format (e.g., "03")
+        - msg (bytes): ACK data (e.g., b"\x03")
         - seq (int): Sequence number to associate with this message
         """
-        try:
-            # Convert the hex string to integer (msg is a single byte: vdisp_mode)
-            vdisp_mode = int(msg, 16)
-
-            # Map vdisp_mode to description
-            image_mode_map = {
-                0: "Split Screen (Main: Zoom & Thermal. Sub: Wide Angle)",
-                1: "Split Screen (Main: Wide Angle & Thermal. Sub: Zoom)",
-                2: "Split Screen (Main: Zoom & Wide Angle. Sub: Thermal)",
-                3: "Single Images (Main: Zoom. Sub: Thermal)",
-                4: "Single Images (Main: Zoom. Sub: Wide Angle)",
-                5: "Single Images (Main: Wide Angle. Sub: Thermal)",
-                6: "Single Images (Main: Wide Angle. Sub: Zoom)",
-                7: "Single Images (Main: Thermal. Sub: Zoom)",
-                8: "Single Images (Main: Thermal. Sub: Wide Angle)",
-            }
-
-            # Assign values to the message object
-            self._request_gimbal_camera_image_mode_msg.seq = seq
-            self._request_gimbal_camera_image_mode_msg.vdisp_mode = vdisp_mode
-            self._request_gimbal_camera_image_mode_msg.description = image_mode_map.get(vdisp_mode, "Unknown mode")
+        return self._parseImageMode(self._request_gimbal_camera_image_mode_msg, msg, seq)
 
-        except Exception as e:
-            print(f"Failed to parse gimbal camera image mode message: {e}")
-    def parseSendGimbalCameraImageModeMsg(self, msg:str, seq:int):
+    def parseSendGimbalCameraImageModeMsg(self, msg:bytes, seq:int):
         """
         Parse the gimbal camera image mode send message.
         """
-        vdisp_mode = int(msg, 16)
-
-        # Map vdisp_mode to description
-        image_mode_map = {
-                0: "Split Screen (Main: Zoom & Thermal. Sub: Wide Angle)",
-                1: "Split Screen (Main: Wide Angle & Thermal. Sub: Zoom)",
-                2: "Split Screen (Main: Zoom & Wide Angle. Sub: Thermal)",
-                3: "Single Images (Main: Zoom. Sub: Thermal)",
-                4: "Single Images (Main: Zoom. Sub: Wide Angle)",
-                5: "Single Images (Main: Wide Angle. Sub: Thermal)",
-                6: "Single Images (Main: Wide Angle. Sub: Zoom)",
-                7: "Single Images (Main: Thermal. Sub: Zoom)",
-                8: "Single Images (Main: Thermal. Sub: Wide Angle)",
-            }
-
-        try:
-            self._send_gimbal_camera_image_mode_msg.seq = seq
-            self._send_gimbal_camera_image_mode_msg.vdisp_mode = vdisp_mode
-            self._send_gimbal_camera_image_mode_msg.description = image_mode_map.get(vdisp_mode, "Unknown mode")
-        except Exception as e:
-            print(f"Failed to parse gimbal camera image mode message: {e}")
+        return self._parseImageMode(self._send_gimbal_camera_image_mode_msg, msg, seq)
     
     
     ##################################################
@@ -1127,6 +1396,9 @@ class SIYISDK:
     def getCameraTypeString(self):
         return(self._hw_msg.cam_type_str)
 
+    def getCameraType(self):
+        return(self._hw_msg.cam_type)
+
     def getRecordingState(self):
         return(self._record_msg.state)
 
@@ -1167,11 +1439,12 @@ class SIYISDK:
         return(self._request_gimbal_camera_image_mode_msg.vdisp_mode, self._request_gimbal_camera_image_mode_msg.description)
 
     def getRTSPURLs(self):
-        if self._hw_msg.cam_type_str == 'A8 mini':
+        cam_type = self._hw_msg.cam_type
+        if cam_type == cameras.CamType.A8_MINI:
             return({"rgb": "rtsp://192.168.144.25:8554/main.264", "thermal": ""})
-        elif self.getCameraTypeString() == 'ZT6' or self.getCameraTypeString() == 'ZT30':
-            main_url = "rtsp://192.168.144.25:8554/video1"
-            sub_url = "rtsp://192.168.144.25:8554/video2"
+        elif cam_type in (cameras.CamType.ZT6, cameras.CamType.ZT30):
+            main_url = _RTSP_MAIN_URL
+            sub_url = _RTSP_SUB_URL
             
             # Request current image mode
             if not self.requestGimbalCameraImageMode():
@@ -1185,29 +1458,13 @@ class SIYISDK:
                 mode, _ = self.getGimbalCameraImageMode()
                 
                 # Map URLs based on image mode
-                if mode == 0:  # Split Screen (Main: Zoom & Thermal. Sub: Wide Angle)
-                    return({"rgb": main_url, "thermal": main_url})
-                elif mode == 1:  # Split Screen (Main: Wide Angle & Thermal. Sub: Zoom)
-                    return({"rgb": main_url, "thermal": main_url})
-                elif mode == 2:  # Split Screen (Main: Zoom & Wide Angle. Sub: Thermal)
-                    return({"rgb": main_url, "thermal": sub_url})
-                elif mode == 3:  # Single Image (Main: Zoom. Sub: Thermal)
-                    return({"rgb": main_url, "thermal": sub_url})
-                elif mode == 4:  # Single Image (Main: Zoom. Sub: Wide Angle)
-                    return({"rgb": main_url, "rgb_wide": sub_url})
-                elif mode == 5:  # Single Image (Main: Wide Angle. Sub: Thermal)
-                    return({"rgb": main_url, "thermal": sub_url})
-                elif mode == 6:  # Single Image (Main: Wide Angle. Sub: Zoom)
-                    return({"rgb_wide": main_url, "rgb": sub_url})
-                elif mode == 7:  # Single Image (Main: Thermal. Sub: Zoom)
-                    return({"thermal": main_url, "rgb": sub_url})
-                elif mode == 8:  # Single Image (Main: Thermal. Sub: Wide Angle)
-                    return({"thermal": main_url, "rgb_wide": sub_url})
+                if 0 <= mode < len(_RTSP_MODE_MAP):
+                    return dict(_RTSP_MODE_MAP[mode])
                 else:
-                    self._logger.warning(f"Unknown image mode: {mode}")
+                    self._logger.warning("Unknown image mode: %s", mode)
                     return(None, None)
             except (AttributeError, Exception) as e:
-                self._logger.warning(f"Error getting image mode: {e}, defaulting to mode 3 (Single Image - Main: Zoom, Sub: Thermal)")
+                self._logger.warning("Error getting image mode: %s, defaulting to mode 3 (Single Image - Main: Zoom, Sub: Thermal)", e)
                 return({"rgb": main_url, "thermal": sub_url})
         else:
             self._logger.warning("Camera not supported for RTSP URLs.")
@@ -1238,29 +1495,31 @@ class SIYISDK:
         th = err_thresh
         gain = kp
         while(True):
+            # Wait for the reply, instead of spinning on the attitude sequence
+            self._att_event.clear()
             self.requestGimbalAttitude()
-            if self._att_msg.seq==self._last_att_seq:
+            if not self._att_event.wait(timeout=0.05):
                 self._logger.info("Did not get new attitude msg")
                 self.requestGimbalSpeed(0,0)
                 continue
 
             self._last_att_seq = self._att_msg.seq
 
-            yaw_err = -yaw + self._att_msg.yaw # NOTE for some reason it's reversed!!
-            pitch_err = pitch - self._att_msg.pitch
+            done, y_speed_sp, p_speed_sp = _controlStep(float(yaw), float(pitch), float(self._att_msg.yaw), float(self._att_msg.pitch),
+                                                         float(gain), float(th))
 
-            self._logger.debug("yaw_err= %s", yaw_err)
-            self._logger.debug("pitch_err= %s", pitch_err)
+            if self._debug_enabled:
+                self._logger.debug("yaw_err= %s", -yaw + self._att_msg.yaw)
+                self._logger.debug("pitch_err= %s", pitch - self._att_msg.pitch)
 
-            if (abs(yaw_err) <= th and abs(pitch_err)<=th):
+            if done:
                 self.requestGimbalSpeed(0, 0)
                 self._logger.info("Goal rotation is reached")
                 break
 
-            y_speed_sp = max(min(100, int(gain*yaw_err)), -100)
-            p_speed_sp = max(min(100, int(gain*pitch_err)), -100)
-            self._logger.debug("yaw speed setpoint= %s", y_speed_sp)
-            self._logger.debug("pitch speed setpoint= %s", p_speed_sp)
+            if self._debug_enabled:
+                self._logger.debug("yaw speed setpoint= %s", y_speed_sp)
+                self._logger.debug("pitch speed setpoint= %s", p_speed_sp)
             self.requestGimbalSpeed(y_speed_sp, p_speed_sp)
 
             sleep(0.1) # command frequency
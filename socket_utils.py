@@ -0,0 +1,195 @@
+"""
+Socket helpers used by the SIYI SDK: buffer tuning, batched receive with recvmmsg(), and the zero-copy sender
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import socket
+import struct
+import sys
+from collections import deque
+
+
+# Linux values, not exported by the socket module
+IP_MTU_DISCOVER = getattr(socket, "IP_MTU_DISCOVER", 10)
+IP_PMTUDISC_DO = getattr(socket, "IP_PMTUDISC_DO", 2)
+IP_RECVERR = getattr(socket, "IP_RECVERR", 11)
+SO_ZEROCOPY = getattr(socket, "SO_ZEROCOPY", 60)
+MSG_ZEROCOPY = getattr(socket, "MSG_ZEROCOPY", 0x4000000)
+MSG_ERRQUEUE = getattr(socket, "MSG_ERRQUEUE", 0x2000)
+SO_EE_ORIGIN_ZEROCOPY = 5
+# struct sock_extended_err: ee_errno, ee_origin, ee_type, ee_code, ee_pad, ee_info, ee_data
+_SOCK_EXTENDED_ERR = struct.Struct("=IBBBBII")
+
+
+def tuneUDPSocket(sock, rcvbuf=1<<20, sndbuf=1<<18):
+    """
+    Sets larger kernel buffers on a UDP socket, enables SO_REUSEADDR/SO_REUSEPORT and disables fragmentation, where supported.
+    Options that are not supported by the platform are skipped.
+
+    Params
+    --
+    - sock [socket.socket] UDP socket
+    - rcvbuf [int] Receive buffer size, in bytes
+    - sndbuf [int] Send buffer size, in bytes
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf),
+               (socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf),
+               (socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)]
+    if hasattr(socket, "SO_REUSEPORT"):
+        options.append((socket.SOL_SOCKET, socket.SO_REUSEPORT, 1))
+    if sys.platform.startswith("linux"):
+        options.append((socket.IPPROTO_IP, IP_MTU_DISCOVER, IP_PMTUDISC_DO))
+    for level, opt, val in options:
+        try:
+            sock.setsockopt(level, opt, val)
+        except OSError:
+            pass
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p),
+                ("iov_len", ctypes.c_size_t)]
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [("msg_name", ctypes.c_void_p),
+                ("msg_namelen", ctypes.c_uint32),
+                ("msg_iov", ctypes.POINTER(_IOVec)),
+                ("msg_iovlen", ctypes.c_size_t),
+                ("msg_control", ctypes.c_void_p),
+                ("msg_controllen", ctypes.c_size_t),
+                ("msg_flags", ctypes.c_int)]
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr),
+                ("msg_len", ctypes.c_uint)]
+
+
+def _loadRecvMMsg():
+    """
+    Returns the libc recvmmsg() function, or None if it is not available (non-Linux)
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fn = libc.recvmmsg
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    fn.restype = ctypes.c_int
+    return fn
+
+_recvmmsg = _loadRecvMMsg()
+HAVE_RECVMMSG = _recvmmsg is not None
+
+
+class RecvMMsg:
+    """
+    Receives up to n queued datagrams with a single recvmmsg(2) system call.
+    Datagrams are written into n preallocated buffers, which are reused on every call.
+    """
+    def __init__(self, n=32, bufsize=2048) -> None:
+        """
+        Params
+        --
+        - n [int] Maximum number of datagrams received per call
+        - bufsize [int] Size of each receive buffer, in bytes
+        """
+        if not HAVE_RECVMMSG:
+            raise OSError("recvmmsg() is not available on this platform")
+        self._n = n
+        self.buffers = [bytearray(bufsize) for _ in range(n)]
+        # Keep the ctypes views alive, they pin the bytearrays the kernel writes into
+        self._c_bufs = [(ctypes.c_char * bufsize).from_buffer(b) for b in self.buffers]
+        self._iovs = (_IOVec * n)()
+        self._msgs = (_MMsgHdr * n)()
+        for i in range(n):
+            self._iovs[i].iov_base = ctypes.addressof(self._c_bufs[i])
+            self._iovs[i].iov_len = bufsize
+            self._msgs[i].msg_hdr.msg_iov = ctypes.pointer(self._iovs[i])
+            self._msgs[i].msg_hdr.msg_iovlen = 1
+
+    def recv(self, sock):
+        """
+        Drains the datagrams that are already queued on the socket, without blocking.
+
+        Params
+        --
+        - sock [socket.socket] UDP socket
+
+        Returns
+        --
+        [list] of (buffer, nbytes) tuples. Buffers are overwritten by the next call
+        """
+        count = _recvmmsg(sock.fileno(), self._msgs, self._n, socket.MSG_DONTWAIT, None)
+        if count < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+        return [(self.buffers[i], self._msgs[i].msg_len) for i in range(count)]
+
+
+class ZeroCopySender:
+    """
+    Sends datagrams with MSG_ZEROCOPY (Linux 4.14+), so the kernel does not copy them.
+    The kernel reads the data after sendmsg() returns, so every sent buffer is kept alive
+    until its completion notification is read from the socket error queue with reap().
+    """
+    def __init__(self, sock) -> None:
+        """
+        Enables SO_ZEROCOPY on the socket. Raises OSError if the platform does not support it.
+
+        Params
+        --
+        - sock [socket.socket] UDP socket
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("MSG_ZEROCOPY is only available on Linux")
+        sock.setsockopt(socket.SOL_SOCKET, SO_ZEROCOPY, 1)
+        self._sock = sock
+        # (id, buffer) of the sends that are not completed yet. The kernel numbers them from 0
+        self._inflight: deque = deque()
+        self._next_id = 0
+
+    def pending(self):
+        """
+        Returns the number of sends waiting for their completion notification
+        """
+        return len(self._inflight)
+
+    def send(self, data, addr):
+        """
+        Sends one datagram without copying it
+
+        Params
+        --
+        - data [bytes] Datagram. It must not be modified until it is completed
+        - addr [tuple] Destination (ip, port)
+        """
+        self._sock.sendmsg([data], [], MSG_ZEROCOPY, addr)
+        self._inflight.append((self._next_id, data))
+        self._next_id = (self._next_id+1) & 0xffffffff
+
+    def reap(self):
+        """
+        Reads the completion notifications from the socket error queue, without blocking,
+        and releases the completed buffers
+        """
+        inflight = self._inflight
+        while inflight:
+            try:
+                _, ancdata, _, _ = self._sock.recvmsg(0, 64, MSG_ERRQUEUE | socket.MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                return
+            for level, type_, cdata in ancdata:
+                if level != socket.IPPROTO_IP or type_ != IP_RECVERR or len(cdata) < _SOCK_EXTENDED_ERR.size:
+                    continue
+                ee_errno, origin, _, _, _, lo, hi = _SOCK_EXTENDED_ERR.unpack_from(cdata)
+                if origin != SO_EE_ORIGIN_ZEROCOPY or ee_errno != 0:
+                    continue
+                # Sends [lo, hi] are completed, and complete in order
+                while inflight and ((hi - inflight[0][0]) & 0xffffffff) < 0x80000000:
+                    inflight.popleft()
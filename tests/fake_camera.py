@@ -0,0 +1,66 @@
+"""
+Fake SIYI camera on the UDP loopback, used by the offline tests.
+Replies to a few requests with fixed values, without any hardware.
+"""
+import binascii
+import socket
+import struct
+import threading
+
+
+def frame(cmd_id, data=b'', seq=0):
+    """
+    Returns a full SIYI message (header to CRC16) for a CMD ID byte and its data bytes
+    """
+    msg = b'\x55\x66\x02' + struct.pack('<HHB', len(data), seq, cmd_id) + data
+    return msg + struct.pack('<H', binascii.crc_hqx(msg, 0))
+
+
+class FakeCamera:
+    # Reply data of each CMD ID
+    REPLIES = {
+        0x01: b'\x00\x00\x00\x00\x01\x02\x03\x00\x00\x00\x00\x00',   # firmware version
+        0x02: b'7312345678',                                      # hardware ID, A8 mini
+        0x0a: b'\x00\x00\x00\x01\x02\x00',                        # gimbal info
+        0x0d: struct.pack('<6h', 123, -456, 7, -1, 2, -3),        # attitude
+        0x0e: struct.pack('<3h', 1, 2, 3),                        # set angles
+        0x18: b'\x04\x05',                                        # current zoom
+    }
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.settimeout(0.1)
+        self.port = self.sock.getsockname()[1]
+        # (cmd_id, data) of every received message
+        self.received = []
+        # The SDK checks the connection from the sequence of the firmware version replies
+        self._seq = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop:
+            try:
+                datagram, addr = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            # Requests can be coalesced into one datagram
+            i = 0
+            out = b''
+            while i + 10 <= len(datagram):
+                data_len, = struct.unpack_from('<H', datagram, i+3)
+                cmd_id = datagram[i+7]
+                self.received.append((cmd_id, datagram[i+8:i+8+data_len]))
+                if cmd_id in self.REPLIES:
+                    self._seq = (self._seq+1) & 0xffff
+                    out += frame(cmd_id, self.REPLIES[cmd_id], self._seq)
+                i += 10 + data_len
+            if out:
+                self.sock.sendto(out, addr)
+
+    def close(self):
+        self._stop = True
+        self._thread.join()
+        self.sock.close()
@@ -0,0 +1,247 @@
+"""
+@file test_offline.py
+@Description: Tests of the SIYI SDK that do not need a camera. Parsing runs on crafted messages,
+              and the connection tests use a fake camera on the UDP loopback.
+              Run with: python -m unittest tests.test_offline
+"""
+import logging
+import struct
+import sys
+import os
+import threading
+import unittest
+from time import sleep
+
+current = os.path.dirname(os.path.realpath(__file__))
+parent_directory = os.path.dirname(current)
+
+sys.path.append(parent_directory)
+sys.path.append(current)
+
+import cameras
+import siyi_sdk
+from siyi_sdk import SIYISDK
+from siyi_message import SIYIMESSAGE, COMMAND
+from fake_camera import FakeCamera, frame
+
+logging.disable(logging.CRITICAL)
+
+
+def attitude(yaw):
+    return frame(0x0d, struct.pack('<6h', yaw, 2, 3, 4, 5, 6))
+
+
+def feed(sdk, *datagrams):
+    """
+    Passes each datagram to the SDK, as received in its receive buffer
+    """
+    for datagram in datagrams:
+        buf = bytearray(sdk._BUFF_SIZE)
+        buf[:len(datagram)] = datagram
+        sdk.bufferCallback(buf, len(datagram))
+
+
+class TestBufferCallback(unittest.TestCase):
+    def setUp(self):
+        self.sdk = SIYISDK()
+        # Yaw of every parsed attitude message, in tenths of a degree
+        self.yaws = []
+        self.sdk._dispatch[0x0d] = lambda data, seq: self.yaws.append(struct.unpack_from('<h', data)[0])
+
+    def tearDown(self):
+        self.sdk.close()
+
+    def feed(self, *datagrams):
+        feed(self.sdk, *datagrams)
+
+    def test_several_frames_in_one_datagram(self):
+        self.feed(attitude(1) + attitude(2) + attitude(3))
+        self.assertEqual(self.yaws, [1, 2, 3])
+        self.assertEqual(len(self.sdk._parse_buf), 0)
+
+    def test_frame_split_across_datagrams(self):
+        msg = attitude(1) + attitude(2)
+        for cut in range(1, len(msg)):
+            self.yaws.clear()
+            self.feed(msg[:cut], msg[cut:])
+            self.assertEqual(self.yaws, [1, 2], "cut at %d" % cut)
+
+    def test_garbage_prefix(self):
+        self.feed(b'\x00\x55\x12\x66\x55' + attitude(7))
+        self.assertEqual(self.yaws, [7])
+
+    def test_bad_crc(self):
+        bad = bytearray(attitude(1))
+        bad[-1] ^= 0xff
+        self.feed(bytes(bad) + attitude(2), attitude(3))
+        self.assertEqual(self.yaws, [2, 3])
+
+    def test_bogus_length(self):
+        # A false header claiming 2000 data bytes must not hold back the valid messages that follow
+        bogus = b'\x55\x66\x02' + struct.pack('<HHB', 2000, 0, 0x0d) + b'\x00'*4
+        self.feed(bogus, *[attitude(k) for k in range(10)])
+        self.assertEqual(self.yaws, list(range(10)))
+
+    def test_truncated_frame(self):
+        self.feed(attitude(1)[:15] + attitude(2), attitude(3), attitude(4))
+        self.assertEqual(self.yaws, [2, 3, 4])
+
+    def test_short_data_is_not_parsed(self):
+        self.feed(frame(0x0d, b'\x01\x02'))
+        self.assertEqual(self.yaws, [])
+
+    def test_parser_thread(self):
+        sdk = SIYISDK(parse_thread=True)
+        self.addCleanup(sdk.close)
+        sdk._parse_thread.start()
+        yaws = []
+        sdk._dispatch[0x0d] = lambda data, seq: yaws.append(struct.unpack_from('<h', data)[0])
+        bad = bytearray(attitude(1))
+        bad[-1] ^= 0xff
+        feed(sdk, bytes(bad) + attitude(2) + attitude(3))
+        sdk._parse_q.join()
+        self.assertEqual(yaws, [2, 3])
+
+    def test_parsed_values(self):
+        sdk = SIYISDK()
+        self.addCleanup(sdk.close)
+        feed(sdk, frame(0x0d, struct.pack('<6h', 123, -456, 7, -1, 2, -3)) + frame(0x18, b'\x04\x05') +
+             frame(0x02, b'7312345678'))
+        self.assertEqual(sdk.getAttitude(), (12.3, -45.6, 0.7))
+        self.assertEqual(sdk.getAttitudeSpeed(), (-0.1, 0.2, -0.3))
+        self.assertEqual(sdk.getCurrentZoomLevel(), 4.5)
+        self.assertEqual(sdk.getCameraTypeString(), 'A8 mini')
+
+
+class TestDecodeBytes(unittest.TestCase):
+    def setUp(self):
+        self.msg = SIYIMESSAGE()
+
+    def test_valid(self):
+        data = struct.pack('<6h', 1, 2, 3, 4, 5, 6)
+        self.assertEqual(self.msg.decodeBytes(frame(0x0d, data, seq=5)), (data, 12, 0x0d, 5))
+
+    def test_no_data(self):
+        self.assertEqual(self.msg.decodeBytes(frame(0x01)), (b'', 0, 0x01, 0))
+
+    def test_bad_crc(self):
+        bad = bytearray(frame(0x0d, b'\x01'))
+        bad[-2] ^= 0x01
+        self.assertIsNone(self.msg.decodeBytes(bytes(bad)))
+
+    def test_crc_already_checked(self):
+        bad = bytearray(frame(0x0d, b'\x01'))
+        bad[-2] ^= 0x01
+        self.assertEqual(self.msg.decodeBytes(bytes(bad), check_crc=False), (b'\x01', 1, 0x0d, 0))
+
+    def test_too_short(self):
+        self.assertIsNone(self.msg.decodeBytes(b'\x55\x66\x01'))
+
+
+class TestEncodeMsgBytes(unittest.TestCase):
+    def test_same_as_hex_encoding(self):
+        msg = SIYIMESSAGE()
+        cases = [('', COMMAND.ACQUIRE_FW_VER), ('', COMMAND.ACQUIRE_GIMBAL_ATT), ('01', COMMAND.MANUAL_ZOOM),
+                 ('9cff64ff', COMMAND.GIMBAL_SPEED), ('460596fc', COMMAND.SET_GIMBAL_ATTITUDE),
+                 ('01010005d002b80b1e', COMMAND.SEND_CODEC_SPECS_TO_GIMBAL_CAMERA)]
+        for data, cmd_id in cases:
+            self.assertEqual(msg.encodeMsgBytes(bytes.fromhex(data), cmd_id), bytes.fromhex(msg.encodeMsg(data, cmd_id)))
+
+    def test_round_trip(self):
+        out = SIYIMESSAGE()
+        self.assertEqual(SIYIMESSAGE().decodeBytes(out.setGimbalAttitude(1350, -900)),
+                         (struct.pack('<hh', 1350, -900), 4, 0x0e, 0))
+
+
+class TestTables(unittest.TestCase):
+    def setUp(self):
+        # Not connected, so requests are sent directly to the fake camera
+        self.cam = FakeCamera()
+        self.addCleanup(self.cam.close)
+        self.sdk = SIYISDK(server_ip='127.0.0.1', port=self.cam.port)
+        self.addCleanup(self.sdk.close)
+
+    def setCamera(self, hw_id):
+        self.sdk.parseHardwareIDMsg(hw_id, 0)
+
+    def sentAngles(self):
+        sleep(0.05)
+        angles = [data for cmd_id, data in self.cam.received if cmd_id == 0x0e]
+        return struct.unpack('<hh', angles[-1])
+
+    def test_angle_limits(self):
+        self.setCamera(b'7312345678')
+        self.assertEqual(self.sdk._hw_msg.cam_type, cameras.CamType.A8_MINI)
+        self.assertTrue(self.sdk.requestSetAngles(200, -100))
+        self.assertEqual(self.sentAngles(), (1350, -900))
+        self.assertTrue(self.sdk.requestSetAngles(-10.5, 20))
+        self.assertEqual(self.sentAngles(), (-105, 200))
+
+        self.setCamera(b'8312345678')
+        self.assertTrue(self.sdk.requestSetAngles(300, 30))
+        self.assertEqual(self.sentAngles(), (2700, 250))
+
+    def test_unsupported_camera(self):
+        self.assertFalse(self.sdk.requestSetAngles(0, 0))
+        self.setCamera(b'7512345678')
+        self.assertFalse(self.sdk.requestSetAngles(0, 0))
+
+    def test_rtsp_urls(self):
+        self.setCamera(b'7312345678')
+        self.assertEqual(self.sdk.getRTSPURLs(), {"rgb": "rtsp://192.168.144.25:8554/main.264", "thermal": ""})
+
+        self.setCamera(b'8312345678')
+        self.assertEqual(len(siyi_sdk._RTSP_MODE_MAP), len(siyi_sdk._IMAGE_MODE_DESCRIPTIONS))
+        for mode, urls in enumerate(siyi_sdk._RTSP_MODE_MAP):
+            self.sdk.parseRequestGimbalCameraImageModeMsg(bytes([mode]), 0)
+            self.assertEqual(self.sdk.getRTSPURLs(), urls)
+        self.sdk.parseRequestGimbalCameraImageModeMsg(bytes([len(siyi_sdk._RTSP_MODE_MAP)]), 0)
+        self.assertEqual(self.sdk.getRTSPURLs(), (None, None))
+
+        self.setCamera(b'6B12345678')
+        self.assertEqual(self.sdk.getRTSPURLs(), (None, None))
+
+    def test_min_data_len_commands_have_parsers(self):
+        self.assertLessEqual(set(siyi_sdk._MIN_DATA_LEN), set(self.sdk._dispatch))
+
+
+class TestLoopback(unittest.TestCase):
+    def setUp(self):
+        self.cam = FakeCamera()
+        self.addCleanup(self.cam.close)
+
+    def test_connect(self):
+        threads = threading.active_count()
+        for parse_thread in (False, True):
+            with SIYISDK(server_ip='127.0.0.1', port=self.cam.port, parse_thread=parse_thread) as sdk:
+                self.assertTrue(sdk.connect())
+                sdk.requestGimbalInfo()
+                sleep(0.2)
+                self.assertEqual(sdk.getFirmwareVersion(), '01020300')
+                self.assertEqual(sdk.getHardwareID(), '7312345678')
+                self.assertEqual(sdk.getAttitude(), (12.3, -45.6, 0.7))
+                self.assertEqual(sdk.getRecordingState(), 1)
+
+                self.assertTrue(sdk.requestSetAngles(200, -100))
+                sleep(0.1)
+                self.assertIn((0x0e, struct.pack('<hh', 1350, -900)), self.cam.received)
+
+                sdk.disconnect()
+                self.assertFalse(sdk.isConnected())
+                self.assertTrue(sdk.connect())
+        # close() ends the threads of the SDK
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_double_connect(self):
+        with SIYISDK(server_ip='127.0.0.1', port=self.cam.port) as sdk:
+            self.assertTrue(sdk.connect())
+            self.assertTrue(sdk.connect())
+            self.assertTrue(sdk.isConnected())
+            # The connection check keeps running after the second connect()
+            self.cam.close()
+            sleep(2.5)
+            self.assertFalse(sdk.isConnected())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Optional io_uring receive backend for the SIYI SDK. Needs the liburing package (pip install liburing)
+"""
+try:
+    import liburing  # type: ignore
+    HAVE_LIBURING = True
+except ImportError:
+    liburing = None
+    HAVE_LIBURING = False
+
+
+class URingReceiver:
+    """
+    Keeps n receive operations queued on a UDP socket with io_uring.
+    The kernel writes datagrams into n preallocated buffers, without a recv system call per datagram.
+
+    The ring file descriptor is readable when completions are available, so it is waited on with the
+    selector of the event loop. The liburing bindings keep the GIL while blocking in the kernel,
+    so the ring itself is never waited on.
+    """
+    def __init__(self, sock, callback, n=32, bufsize=2048, sqpoll=False) -> None:
+        """
+        Raises OSError if io_uring is not available.
+
+        Params
+        --
+        - sock [socket.socket] UDP socket
+        - callback [function] Called as callback(buffer, nbytes) for every received datagram
+        - n [int] Number of queued receive operations
+        - bufsize [int] Size of each receive buffer, in bytes
+        - sqpoll [bool] Let a kernel thread poll the submission queue, so resubmitting is not a system call either
+        """
+        if not HAVE_LIBURING:
+            raise OSError("The liburing package is not installed")
+        self._fd = sock.fileno()
+        self._callback = callback
+        self._ring = liburing.Ring()
+        self._cqe = liburing.Cqe()
+        flags = liburing.IORING_SETUP_SQPOLL if sqpoll else 0
+        # Raises OSError when the kernel is too old, or io_uring is disabled
+        liburing.io_uring_queue_init(2*n, self._ring, flags)
+        # The kernel writes into these buffers, they must not be resized or freed while queued
+        self.buffers = [bytearray(bufsize) for _ in range(n)]
+        for i in range(n):
+            self._prepRecv(i)
+        liburing.io_uring_submit(self._ring)
+
+    def fileno(self):
+        """
+        Returns the ring file descriptor, readable when completions are available
+        """
+        return self._ring.ring_fd
+
+    def _prepRecv(self, i):
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        liburing.io_uring_prep_recv(sqe, self._fd, self.buffers[i], 0)
+        liburing.io_uring_sqe_set_data64(sqe, i)
+
+    def reap(self):
+        """
+        Passes the received datagrams to the callback, in arrival order, and queues their buffers again.
+        Does not block.
+        """
+        ring = self._ring
+        cqe = self._cqe
+        peek = liburing.io_uring_peek_cqe
+        seen = liburing.io_uring_cqe_seen
+        buffers = self.buffers
+        callback = self._callback
+        done = []
+        try:
+            while True:
+                try:
+                    peek(ring, cqe)
+                except BlockingIOError:
+                    break
+                entry = cqe[0]
+                i, res = entry.user_data, entry.res
+                seen(ring, entry)
+                done.append(i)
+                # Errors (e.g. ICMP port unreachable) are dropped, the buffer is queued again
+                if res > 0:
+                    callback(buffers[i], res)
+        finally:
+            for i in done:
+                self._prepRecv(i)
+            if done:
+                liburing.io_uring_submit(ring)
+
+    def close(self):
+        liburing.io_uring_queue_exit(self._ring)